@@ -1,4 +1,3 @@
-import json
 import time
 from typing import Any, TypeVar
 from contextlib import asynccontextmanager
@@ -14,10 +13,15 @@ from .base import BaseConnection, MultipleQueryResults, SingleQueryResult
 T = TypeVar("T")
 
 
+def _orjson_dumps(value: Any) -> str:
+    # asyncpg's text codecs expect str; non-str keys are allowed to match json.dumps.
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 class PostgresConnection(BaseConnection):
     CONNECTION_TYPES_CODES = (
-        ("json", json.dumps, orjson.loads, "pg_catalog"),
-        ("jsonb", json.dumps, orjson.loads, "pg_catalog"),
+        ("json", _orjson_dumps, orjson.loads, "pg_catalog"),
+        ("jsonb", _orjson_dumps, orjson.loads, "pg_catalog"),
     )
 
     def __init__(
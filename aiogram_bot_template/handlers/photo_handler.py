@@ -8,7 +8,7 @@ from aiogram.fsm.context import FSMContext
 from aiogram.types import Message, PhotoSize, FSInputFile
 from aiogram.utils.i18n import gettext as _
 from redis.asyncio import Redis
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, Set, Tuple, Optional, Any
 from contextlib import suppress
 from aiogram.exceptions import TelegramBadRequest
 
@@ -26,6 +26,8 @@ router = Router(name="photo-handler")
 
 user_batch_tasks: Dict[int, asyncio.Task] = {}
 user_batch_cache: Dict[int, List[Message]] = {}
+# Strong references to fire-and-forget tasks, so they are not garbage-collected mid-flight.
+background_tasks: Set[asyncio.Task] = set()
 DEBOUNCE_DELAY_SECONDS = 2.5
 MIN_PHOTOS_PER_PARENT = 4
 
@@ -131,6 +133,20 @@ async def _download_one_photo(
         structlog.get_logger(__name__).warning("Failed to download one photo", file_id=photo.file_id)
         return None
 
+
+async def _precompute_identity_centroid(
+    file_unique_ids: List[str], cache_pool: Redis, photo_manager: PhotoProcessingManager, log
+) -> None:
+    """
+    Computes and caches a parent's identity centroid in the background, so the
+    generation pipeline finds it in Redis instead of computing it on the critical path.
+    """
+    try:
+        await photo_manager.get_or_compute_identity_centroid(file_unique_ids, cache_pool)
+    except Exception:
+        log.exception("Failed to precompute identity centroid.")
+
+
 async def process_photo_batch(
     messages: List[Message], state: FSMContext, bot: Bot, db_pool: asyncpg.Pool, cache_pool: Redis, photo_manager: PhotoProcessingManager
 ):
@@ -227,8 +243,9 @@ async def process_photo_batch(
             # The list is already sorted by identity. Just take the top N photos for the collage.
             best_photos = photos_list[:MIN_PHOTOS_PER_PARENT]
             
-            bytes_tasks = [image_cache.get_cached_image_bytes(p['file_unique_id'], cache_pool) for p in best_photos]
-            cached_results = await asyncio.gather(*bytes_tasks)
+            cached_results = await image_cache.get_cached_image_bytes_many(
+                [p['file_unique_id'] for p in best_photos], cache_pool
+            )
             best_photos_bytes = [b for b, _ in cached_results if b]
             
             # Ensure we have the correct number of byte arrays for the collage function
@@ -251,6 +268,13 @@ async def process_photo_batch(
             updated_photos_collected = other_parent_photos + best_photos
             await state.update_data(photos_collected=updated_photos_collected)
             log.info("Finalized photo selection for parent.", role=role_str, final_count=len(best_photos))
+            centroid_task = asyncio.create_task(
+                _precompute_identity_centroid(
+                    [p["file_unique_id"] for p in best_photos], cache_pool, photo_manager, log
+                )
+            )
+            background_tasks.add(centroid_task)
+            centroid_task.add_done_callback(background_tasks.discard)
 
             source_images_dto = [(p["file_unique_id"], p["file_id"], p["role"]) for p in best_photos]
             sql_insert_image = """
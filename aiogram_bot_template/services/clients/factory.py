@@ -32,6 +32,12 @@ _CLIENT_CLASSES: dict[str, type[Any]] = {
     **dict.fromkeys(_PROVIDER_CONFIG, AsyncOpenAI),
 }
 
+# One instance per client name, so concurrent callers share its HTTP connection pool.
+_CLIENT_INSTANCES: dict[str, Any] = {}
+# Clients built per call. FalAsyncClient holds a per-instance concurrency semaphore
+# across submit and polling; sharing it would cap fal jobs for all users at once.
+_UNSHARED_CLIENTS = frozenset({"fal"})
+
 
 def _create_client_instance(client_name: str) -> Any:
     client_class = _CLIENT_CLASSES.get(client_name)
@@ -57,13 +63,21 @@ def _create_client_instance(client_name: str) -> Any:
     # For clients like Fal, Mock, OpenRouterClient, and our new GoogleGeminiClient
     return client_class()
 
+def _get_shared_client_instance(client_name: str) -> Any:
+    if client_name in _UNSHARED_CLIENTS:
+        return _create_client_instance(client_name)
+    client_instance = _CLIENT_INSTANCES.get(client_name)
+    if client_instance is None:
+        client_instance = _create_client_instance(client_name)
+        _CLIENT_INSTANCES[client_name] = client_instance
+    return client_instance
+
 def get_ai_client(client_name: str) -> Any:
     """
-    Creates an AI client instance for a given client name.
+    Returns the shared AI client instance for a given client name
+    (a fresh one for clients listed in _UNSHARED_CLIENTS).
     """
-    client_lower = client_name.lower()
-    client_instance = _create_client_instance(client_lower)
-    return client_instance
+    return _get_shared_client_instance(client_name.lower())
 
 def get_ai_client_and_model(
     *,
@@ -71,7 +85,7 @@ def get_ai_client_and_model(
     quality: int,
 ) -> tuple[Any, str]:
     """
-    Creates an AI client instance and returns it along with the model name,
+    Returns the shared AI client instance along with the model name,
     based on the generation type and quality tier from settings.
     """
     generation_config = getattr(settings, generation_type.value, None)
@@ -83,5 +97,5 @@ def get_ai_client_and_model(
         raise ValueError(f"Could not find a valid client/model configuration for the request: "
                          f"type='{generation_type}', quality='{quality}'.")
 
-    client_instance = _create_client_instance(tier_config.client.lower())
+    client_instance = _get_shared_client_instance(tier_config.client.lower())
     return client_instance, tier_config.model
\ No newline at end of file
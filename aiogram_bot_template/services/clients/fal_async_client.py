@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import math
 import os
 from contextlib import suppress
@@ -10,6 +9,7 @@ from typing import Any
 from collections.abc import Awaitable, Callable
 
 import aiohttp
+import orjson
 import structlog
 
 from aiogram_bot_template.data.settings import settings
@@ -134,8 +134,8 @@ class FalAsyncClient:
                     if response_type == "bytes":
                         return await resp.read(), resp.headers.get("Content-Type")
 
-                    text = await resp.text()
-                    return json.loads(text) if text else {}
+                    body = await resp.read()
+                    return orjson.loads(body) if body else {}
             except (aiohttp.ClientError, asyncio.TimeoutError) as e:
                 if i >= MAX_HTTP_RETRIES:
                     logger.error("HTTP request failed after all retries", method=method, url=url, error=str(e))
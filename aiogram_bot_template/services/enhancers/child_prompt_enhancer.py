@@ -34,6 +34,9 @@ class ChildFeatureDetails(BaseModel):
     parental_analysis: ParentalFeatureAnalysis
     child_variations: List[ChildCreativeVariation]
 
+# The schema is static; serialize it once instead of on every request.
+_CHILD_FEATURE_SCHEMA_JSON = json.dumps(ChildFeatureDetails.model_json_schema(), indent=2)
+
 
 # --- System Prompt for the LLM ---
 
@@ -111,12 +114,14 @@ async def get_enhanced_child_features(
         image_url=parent_composite_url,
         num_variations=num_variations
     )
+    if num_variations <= 0 or not parent_composite_url:
+        log.warning("Invalid child feature request; skipping the LLM call.")
+        return None
 
     try:
         client = client_factory.get_ai_client(config.client)
         log.info("Requesting structured child features from vision model.")
 
-        schema_definition = ChildFeatureDetails.model_json_schema()
         age_str = _get_age_str(child_age)
         gender_str = "girl" if child_gender == ChildGender.GIRL.value else "boy"
 
@@ -124,7 +129,7 @@ async def get_enhanced_child_features(
             f"Please perform a parental analysis and generate {num_variations} unique creative variations for a {age_str} {gender_str}. "
             "Analyze the parents in the provided 2-panel photo. "
             "Return your analysis as a JSON object that strictly follows this schema:"
-            f"\n\n```json\n{json.dumps(schema_definition, indent=2)}\n```"
+            f"\n\n```json\n{_CHILD_FEATURE_SCHEMA_JSON}\n```"
         )
 
         response = await client.chat.completions.create(
@@ -147,6 +152,9 @@ async def get_enhanced_child_features(
             return None
 
         feature_details = ChildFeatureDetails.model_validate_json(content)
+        if not feature_details.child_variations:
+            log.warning("Child feature enhancer returned no creative variations.")
+            return None
         log.info("Successfully received structured child features.",
                  parent_analysis=feature_details.parental_analysis.model_dump(),
                  variations_count=len(feature_details.child_variations))
@@ -155,9 +163,8 @@ async def get_enhanced_child_features(
         if len(feature_details.child_variations) < num_variations:
             log.warning("LLM returned fewer creative variations than requested.",
                         requested=num_variations, returned=len(feature_details.child_variations))
-            if feature_details.child_variations:
-                cycled_variations = [feature_details.child_variations[i % len(feature_details.child_variations)] for i in range(num_variations)]
-                feature_details.child_variations = cycled_variations
+            cycled_variations = [feature_details.child_variations[i % len(feature_details.child_variations)] for i in range(num_variations)]
+            feature_details.child_variations = cycled_variations
 
         return feature_details
 
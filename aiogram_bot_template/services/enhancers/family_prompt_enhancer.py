@@ -7,6 +7,7 @@ from pydantic import BaseModel, Field, field_validator
 from aiogram_bot_template.data.settings import settings
 from aiogram_bot_template.services.clients import factory as client_factory
 from aiogram_bot_template.services.pipelines import PROMPT_FAMILY_DEFAULT
+from aiogram_bot_template.services.pipelines.prompt_template import fill_placeholders
 
 logger = structlog.get_logger(__name__)
 
@@ -45,6 +46,9 @@ class PhotoshootPlan(BaseModel):
     """A collection of shots for a photoshoot."""
     shots: List[PhotoshootShot]
 
+# The schema is static; serialize it once instead of on every request.
+_PHOTOSHOOT_PLAN_SCHEMA_JSON = json.dumps(PhotoshootPlan.model_json_schema(), indent=2)
+
 
 # --- System Prompt for the LLM ---
 
@@ -102,17 +106,20 @@ async def get_enhanced_family_prompts(
         A list of complete prompt strings, or None on failure.
     """
     log = logger.bind(model=settings.text_enhancer.model, image_url=composite_image_url, num_prompts=num_prompts)
+    if num_prompts <= 0 or not composite_image_url:
+        log.warning("Invalid family prompt request; skipping the LLM call.")
+        return None
+
     try:
         # 1. Get the structured photoshoot plan from the LLM
         client = client_factory.get_ai_client(settings.text_enhancer.client)
         log.info("Requesting diversified photoshoot plan for family photo.")
 
-        schema_definition = PhotoshootPlan.model_json_schema()
         user_prompt_text = (
             f"Generate exactly {num_prompts} diversified shots for a golden-hour meadow portrait. "
             f"Heads/gaze/expression are locked; order MOM-left, CHILD-center, DAD-right. "
             f"Return JSON ONLY matching the schema below.\n\n"
-            f"SCHEMA:\n```json\n{json.dumps(schema_definition, indent=2)}\n```"
+            f"SCHEMA:\n```json\n{_PHOTOSHOOT_PLAN_SCHEMA_JSON}\n```"
         )
 
         response = await client.chat.completions.create(
@@ -136,6 +143,9 @@ async def get_enhanced_family_prompts(
             return None
 
         plan = PhotoshootPlan.model_validate_json(content)
+        if not plan.shots:
+            log.warning("Family prompt enhancer returned a plan without shots.")
+            return None
 
         # 2. Assemble the final prompts by injecting plan details into the base template
         completed_prompts = []
@@ -143,9 +153,10 @@ async def get_enhanced_family_prompts(
             # If we need more prompts than the plan has shots, cycle through the plan
             shot = plan.shots[i % len(plan.shots)]
 
-            final_prompt = PROMPT_FAMILY_DEFAULT
-            final_prompt = final_prompt.replace("{{POSE_AND_COMPOSITION_DATA}}", shot.pose_and_composition.strip())
-            final_prompt = final_prompt.replace("{{PHOTOS_PLAN_DATA}}", shot.wardrobe_plan.strip())
+            final_prompt = fill_placeholders(PROMPT_FAMILY_DEFAULT, {
+                "POSE_AND_COMPOSITION_DATA": shot.pose_and_composition.strip(),
+                "PHOTOS_PLAN_DATA": shot.wardrobe_plan.strip(),
+            })
             completed_prompts.append(final_prompt)
 
         log.info("Successfully generated enhanced family prompts.", count=len(completed_prompts))
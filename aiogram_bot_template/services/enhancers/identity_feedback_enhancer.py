@@ -29,6 +29,9 @@ class IdentityFeedbackResponse(BaseModel):
             raise TypeError("similarity_score must be a float")
         return v
 
+# The schema is static; serialize it once instead of on every request.
+_IDENTITY_FEEDBACK_SCHEMA_JSON = json.dumps(IdentityFeedbackResponse.model_json_schema(), indent=2)
+
 # --- System Prompt for the LLM ---
 
 _IDENTITY_FEEDBACK_SYSTEM_PROMPT = """
@@ -72,6 +75,13 @@ Your output will be used to guide another AI model. You must identify every sing
 - The JSON must strictly adhere to the schema provided in the user prompt. No extra text or explanations.
 """
 
+# The user message carries no per-call data besides the image URLs.
+_IDENTITY_FEEDBACK_USER_PROMPT = (
+    "Analyze the two provided images (Image A: Reference, Image B: Candidate) "
+    "based on the system prompt rules. Return your analysis as a JSON object that "
+    f"strictly follows this schema:\n\n```json\n{_IDENTITY_FEEDBACK_SCHEMA_JSON}\n```"
+)
+
 async def get_identity_feedback(
     reference_image_url: str,
     candidate_image_url: str,
@@ -103,20 +113,13 @@ async def get_identity_feedback(
         client = client_factory.get_ai_client(config.client)
         log.info("Requesting identity similarity feedback from vision model.")
 
-        schema_definition = IdentityFeedbackResponse.model_json_schema()
-        user_prompt_text = (
-            "Analyze the two provided images (Image A: Reference, Image B: Candidate) "
-            "based on the system prompt rules. Return your analysis as a JSON object that "
-            f"strictly follows this schema:\n\n```json\n{json.dumps(schema_definition, indent=2)}\n```"
-        )
-
         response = await client.chat.completions.create(
             model=config.model,
             response_format={"type": "json_object"},
             messages=[
                 {"role": "system", "content": _IDENTITY_FEEDBACK_SYSTEM_PROMPT},
                 {"role": "user", "content": [
-                    {"type": "text", "text": user_prompt_text},
+                    {"type": "text", "text": _IDENTITY_FEEDBACK_USER_PROMPT},
                     {"type": "image_url", "image_url": {"url": reference_image_url}, "detail": "high"},
                     {"type": "image_url", "image_url": {"url": candidate_image_url}, "detail": "high"},
                 ]},
@@ -20,6 +20,10 @@ logger = structlog.get_logger(__name__)
 # --- NEW: Configuration for the iterative refinement process ---
 MAX_REFINEMENT_ITERATIONS = 2  # Total attempts: 1 initial + (N-1) refinements
 MIN_SIMILARITY_THRESHOLD = 0.85  # The target score for both embedding and LLM feedback
+# Upper bound on representations generated at once across all users; each one runs
+# several vision-LLM and image-model calls, so this keeps requests from stampeding the APIs.
+MAX_CONCURRENT_REPRESENTATIONS = 4
+_REPRESENTATION_SEMAPHORE = asyncio.Semaphore(MAX_CONCURRENT_REPRESENTATIONS)
 
 # --- MODIFIED: Enhanced system prompt with strict consistency filter ---
 _TEXTUAL_ENHANCEMENT_SYSTEM_PROMPT = """
@@ -157,24 +161,28 @@ Output:
 
 """
 
+# Fallback texts for the refinement prompt when there are no per-feature corrections.
+_NO_FEEDBACK_TEXT = "No specific feedback available. Perform a general identity enhancement."
+_CLOSE_MATCH_FEEDBACK_TEXT = (
+    "The previous image was a very close match. "
+    "Perform a final pass to perfect all micro-features like skin texture and subtle asymmetries."
+)
+
 
 def _format_feedback_for_prompt(feedback: IdentityFeedbackResponse) -> str:
     """Formats the structured feedback into a human-readable string for the prompt."""
     if not feedback:
-        return "No specific feedback available. Perform a general identity enhancement."
-    
-    lines = [
-        # f"The previous attempt had a similarity score of {feedback.similarity_score:.2f}. "
-        # "Focus on the following corrections:"
-    ]
-    for feature, details in feedback.feedback_details.items():
-        if not details.is_match:
-            lines.append(f"- **{feature.replace('_', ' ').title()}:** {details.feedback}")
+        return _NO_FEEDBACK_TEXT
     
-    if len(lines) == 1:
-        return "The previous image was a very close match. Perform a final pass to perfect all micro-features like skin texture and subtle asymmetries."
+    feedback_text = "\n".join(
+        f"- **{feature.replace('_', ' ').title()}:** {details.feedback}"
+        for feature, details in feedback.feedback_details.items()
+        if not details.is_match
+    )
+    if not feedback_text:
+        return _CLOSE_MATCH_FEEDBACK_TEXT
 
-    return "\n".join(lines)
+    return feedback_text
 
 
 async def _get_identity_feedback_and_score(
@@ -226,6 +234,7 @@ async def get_parent_visual_representation(
     """
     Generates a consolidated visual representation (front and side view) of a parent,
     iteratively refining it to meet a similarity threshold.
+    At most MAX_CONCURRENT_REPRESENTATIONS of these run at the same time.
 
     Args:
         image_uid: The UID to the 2x2 collage of the parent.
@@ -235,6 +244,21 @@ async def get_parent_visual_representation(
         photo_manager: The photo processing manager for worker tasks.
         user_id: The ID of the user requesting the generation, for logging purposes.
     """
+    async with _REPRESENTATION_SEMAPHORE:
+        return await _generate_parent_visual_representation(
+            image_uid, role, identity_centroid, cache_pool, photo_manager, user_id
+        )
+
+
+async def _generate_parent_visual_representation(
+    image_uid: str,
+    role: str,
+    identity_centroid: Optional[np.ndarray],
+    cache_pool: Optional[object],
+    photo_manager: Optional[PhotoProcessingManager],
+    user_id: Optional[int],
+) -> Optional[bytes]:
+    """Runs the extraction and refinement loop behind get_parent_visual_representation."""
     if not photo_manager:
         raise ValueError("PhotoProcessingManager is required for parent visual representation.")
 
@@ -353,12 +377,10 @@ async def get_parent_visual_representation(
             # --- Evaluate the generated image ---
             embedding_score = 0.0
             if identity_centroid is not None:
-                front_bytes, _ = await photo_manager.split_and_stack_image(current_candidate_bytes)
-                if front_bytes:
-                    features = await photo_manager.extract_face_features(front_bytes)
-                    if features and features.get("embedding") is not None:
-                        generated_embedding = features["embedding"]
-                        embedding_score = float(np.dot(generated_embedding, identity_centroid))
+                features = await photo_manager.extract_front_view_features(current_candidate_bytes)
+                if features and features.get("embedding") is not None:
+                    generated_embedding = features["embedding"]
+                    embedding_score = float(np.dot(generated_embedding, identity_centroid))
 
             llm_score, feedback_for_next_iteration = await _get_identity_feedback_and_score(
                 image_url, current_candidate_bytes, cache_pool, attempt_log, photo_manager
@@ -33,6 +33,18 @@ from aiogram_bot_template.utils.status_manager import StatusMessageManager
 from aiogram_bot_template.services.photo_processing_manager import PhotoProcessingManager
 
 
+# Pipeline metadata persisted into the FSM session so later actions can reuse it.
+SESSION_METADATA_KEYS = (
+    "mom_profile_uid",
+    "dad_profile_uid",
+    "mom_front_dad_front_uid",
+    "mom_front_dad_side_uid",
+    "dad_front_mom_side_uid",
+    "parent_front_side_uid",
+    "mom_centroid",
+    "dad_centroid",
+)
+
 PIPELINE_MAP: dict[str, Type[BasePipeline]] = {
     GenerationType.CHILD_GENERATION.value: ChildGenerationPipeline,
     GenerationType.FAMILY_PHOTO.value: FamilyPhotoPipeline,
@@ -80,6 +92,7 @@ async def run_generation_worker(
     status = StatusMessageManager(bot, chat_id, status_message_id)
 
     sent_photo_messages = []
+    frame_tasks: list[asyncio.Task] = []
 
     try:
         if not all([request_id, quality_level is not None, generation_type]):
@@ -111,22 +124,19 @@ async def run_generation_worker(
             photo_manager=photo_manager, db_pool=db_pool
         )
         pipeline_output = await pipeline.prepare_data()
+        await pipeline.flush_status()
 
         if generation_type != GenerationType.IMAGE_EDIT.value:
-            if "mom_profile_uid" not in user_data:
-                session_uids = {
-                    "mom_profile_uid": pipeline_output.metadata.get("mom_profile_uid"),
-                    "dad_profile_uid": pipeline_output.metadata.get("dad_profile_uid"),
-                    "mom_front_dad_front_uid": pipeline_output.metadata.get("mom_front_dad_front_uid"),
-                    "mom_front_dad_side_uid": pipeline_output.metadata.get("mom_front_dad_side_uid"),
-                    "dad_front_mom_side_uid": pipeline_output.metadata.get("dad_front_mom_side_uid"),
-                    "parent_front_side_uid": pipeline_output.metadata.get("parent_front_side_uid"),
-                }
-                if all(session_uids.values()):
-                    await state.update_data(**session_uids)
-                    log.info("Saved parent visual UIDs to FSM state for session.", uids=session_uids)
-                elif generation_type != GenerationType.FAMILY_PHOTO.value:
-                     log.warning("Could not find all required session UIDs in pipeline metadata to save.")
+            # Save session UIDs that are new or were rebuilt by this run (e.g. after cache expiry,
+            # or composites built lazily by a later pipeline).
+            session_data = {
+                key: pipeline_output.metadata[key]
+                for key in SESSION_METADATA_KEYS
+                if pipeline_output.metadata.get(key) and pipeline_output.metadata[key] != user_data.get(key)
+            }
+            if session_data:
+                await state.update_data(**session_data)
+                log.info("Saved parent visual UIDs to FSM state for session.", keys=list(session_data))
 
             await _send_debug_if_enabled(bot, chat_id, cache_pool, pipeline_output.metadata.get("mom_collage_uid"), "[DEBUG] mom_collage_uid.")
             await _send_debug_if_enabled(bot, chat_id, cache_pool, pipeline_output.metadata.get("mom_profile_uid"), "[DEBUG] mom_profile_uid.")
@@ -139,31 +149,39 @@ async def run_generation_worker(
         completed_prompts = pipeline_output.metadata.get("completed_prompts", [pipeline_output.request_payload.get("prompt")])
         image_reference_list = pipeline_output.metadata.get("image_reference_list", [pipeline_output.request_payload.get("image_urls", [])[0]])
 
+        # Frames are independent requests to the image service; start them all at once
+        # and deliver the results in order as they become available. The status message
+        # is not safe for concurrent editors, so only this loop reports progress.
+        frame_payloads = []
         for i in range(generation_count):
-            current_iteration = i + 1
-            log_task = log.bind(sequence=f"{current_iteration}/{generation_count}")
-            
-            await status.update(_("🎨 Painting portrait {current} of {total}...").format(
-                current=current_iteration, total=generation_count
-            ))
-
             payload_override = pipeline_output.request_payload.copy()
-            
-            final_prompt = completed_prompts[i % len(completed_prompts)]
-            image_reference = image_reference_list[i % len(image_reference_list)]
-            
-            payload_override["prompt"] = final_prompt
-            payload_override["image_urls"] = [image_reference]
+            payload_override["prompt"] = completed_prompts[i % len(completed_prompts)]
+            payload_override["image_urls"] = [image_reference_list[i % len(image_reference_list)]]
             payload_override["seed"] = random.randint(1, 1_000_000)
 
             if generation_type == GenerationType.IMAGE_EDIT.value:
                 payload_override["original_generation_type"] = user_data.get("original_generation_type")
 
-            log.info("Final prompt: ", final_prompt=payload_override["prompt"])
+            log.debug("Final prompt.", frame=i + 1, final_prompt=payload_override["prompt"])
+            frame_payloads.append(payload_override)
 
-            result, error_meta = await pipeline.run_generation(
-                pipeline_output, payload_override=payload_override
+        frame_tasks.extend(
+            asyncio.create_task(
+                pipeline.run_generation(pipeline_output, payload_override=payload, report_status=False)
             )
+            for payload in frame_payloads
+        )
+
+        for i, (payload_override, frame_task) in enumerate(zip(frame_payloads, frame_tasks)):
+            current_iteration = i + 1
+            log_task = log.bind(sequence=f"{current_iteration}/{generation_count}")
+            
+            await status.update(_("🎨 Painting portrait {current} of {total}...").format(
+                current=current_iteration, total=generation_count
+            ))
+
+            final_prompt = payload_override["prompt"]
+            result, error_meta = await frame_task
 
             if not result:
                 log_task.error("AI service failed for this frame", meta=error_meta)
@@ -258,6 +276,8 @@ async def run_generation_worker(
         if request_id:
             await generations_repo.update_generation_request_status(db, request_id, "failed_internal")
     finally:
+        for frame_task in frame_tasks:
+            frame_task.cancel()
         current_state = await state.get_state()
         if current_state and current_state not in [
             Generation.waiting_for_next_action, 
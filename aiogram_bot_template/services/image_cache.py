@@ -1,6 +1,7 @@
 import base64
 import json
 import mimetypes
+import orjson
 from redis.asyncio import Redis
 from aiogram import Bot
 from aiogram.types import PhotoSize
@@ -15,6 +16,32 @@ def get_cached_image_proxy_url(unique_id: str) -> str:
     return f"{str(settings.proxy.base_url).strip('/')}/file_cache/{encoded_id}"
 
 
+def composite_uid(top_uid: str, bottom_uid: str, layout: str = "vert") -> str:
+    """Cache key under which the proxy stores a composite rendered from two cached images."""
+    return f"composite_{layout}_{top_uid}_{bottom_uid}"
+
+
+def get_composite_proxy_url(top_uid: str, bottom_uid: str, layout: str = "vert") -> str:
+    """
+    Builds a proxy URL that renders a composite of two cached images on first request.
+    The rendered image is cached under `composite_uid(top_uid, bottom_uid, layout)`.
+    """
+    encoded_top = base64.urlsafe_b64encode(top_uid.encode("ascii")).decode("ascii")
+    encoded_bottom = base64.urlsafe_b64encode(bottom_uid.encode("ascii")).decode("ascii")
+    return f"{str(settings.proxy.base_url).strip('/')}/file_cache/composite/{layout}/{encoded_top}/{encoded_bottom}"
+
+
+CACHE_TTL_SECONDS = 86400  # Cache for 24 hours
+
+
+def _encode_payload(image_bytes: bytes, content_type: str) -> str:
+    payload_dict = {
+        "content_type": content_type,
+        "data": base64.b64encode(image_bytes).decode("ascii"),
+    }
+    return json.dumps(payload_dict)
+
+
 async def cache_image_bytes(
     unique_id: str,
     image_bytes: bytes,
@@ -22,34 +49,77 @@ async def cache_image_bytes(
     redis: Redis,
 ) -> None:
     """Caches image bytes in Redis."""
-    payload_dict = {
-        "content_type": content_type,
-        "data": base64.b64encode(image_bytes).decode("ascii"),
-    }
-    payload_to_cache = json.dumps(payload_dict)
-    await redis.set(unique_id, payload_to_cache, ex=86400)  # Cache for 24 hours
+    payload_to_cache = _encode_payload(image_bytes, content_type)
+    await redis.set(unique_id, payload_to_cache, ex=CACHE_TTL_SECONDS)
     logger.debug("Image cached in Redis", file_unique_id=unique_id)
 
 
-async def get_cached_image_bytes(
-    unique_id: str,
+async def cache_image_bytes_bulk(
+    items: list[tuple[str, bytes, str]],
     redis: Redis,
-) -> tuple[bytes, str] | tuple[None, None]:
-    """Retrieves image bytes and content type from Redis cache."""
-    cached_json = await redis.get(unique_id)
+) -> None:
+    """
+    Caches several images in Redis using a single pipelined round-trip.
+
+    Args:
+        items: A list of (unique_id, image_bytes, content_type) tuples.
+        redis: The Redis connection pool.
+    """
+    if not items:
+        return
+    async with redis.pipeline(transaction=False) as pipe:
+        for unique_id, image_bytes, content_type in items:
+            pipe.set(unique_id, _encode_payload(image_bytes, content_type), ex=CACHE_TTL_SECONDS)
+        await pipe.execute()
+    logger.debug("Images cached in Redis", file_unique_ids=[uid for uid, _, _ in items])
+
+
+async def exists_bulk(unique_ids: list[str], redis: Redis) -> list[bool]:
+    """Checks which of the given images are still present in the Redis cache."""
+    if not unique_ids:
+        return []
+    async with redis.pipeline(transaction=False) as pipe:
+        for unique_id in unique_ids:
+            pipe.exists(unique_id)
+        results = await pipe.execute()
+    return [bool(r) for r in results]
+
+
+def decode_payload(unique_id: str, cached_json: bytes | str | None) -> tuple[bytes, str] | tuple[None, None]:
+    """Decodes a cached image envelope into (image_bytes, content_type), or (None, None)."""
     if not cached_json:
         logger.warning("Requested file not in Redis cache", file_unique_id=unique_id)
         return None, None
     try:
-        payload_dict = json.loads(cached_json)
+        payload_dict = orjson.loads(cached_json)
         content_type = payload_dict["content_type"]
         file_bytes = base64.b64decode(payload_dict["data"])
         return file_bytes, content_type
-    except (json.JSONDecodeError, KeyError, TypeError):
+    except (orjson.JSONDecodeError, KeyError, TypeError):
         logger.exception("Could not decode payload from Redis", file_unique_id=unique_id)
         return None, None
 
 
+async def get_cached_image_bytes(
+    unique_id: str,
+    redis: Redis,
+) -> tuple[bytes, str] | tuple[None, None]:
+    """Retrieves image bytes and content type from Redis cache."""
+    cached_json = await redis.get(unique_id)
+    return decode_payload(unique_id, cached_json)
+
+
+async def get_cached_image_bytes_many(
+    unique_ids: list[str],
+    redis: Redis,
+) -> list[tuple[bytes, str] | tuple[None, None]]:
+    """Retrieves several cached images with a single MGET, in the order of `unique_ids`."""
+    if not unique_ids:
+        return []
+    cached_jsons = await redis.mget(unique_ids)
+    return [decode_payload(uid, cached_json) for uid, cached_json in zip(unique_ids, cached_jsons)]
+
+
 async def download_and_cache_photo(
     photo: PhotoSize,
     bot: Bot,
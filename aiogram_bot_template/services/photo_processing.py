@@ -1,6 +1,7 @@
 # aiogram_bot_template/services/photo_processing.py
 import cv2
 import io
+import queue
 import numpy as np
 import mediapipe as mp
 
@@ -60,12 +61,36 @@ def load_image_bgr_from_bytes(data: bytes) -> Optional[np.ndarray]:
         logger.exception("Failed to load image from bytes.")
         return None
 
+# Recycled encode buffers. They are rewound but never truncated, so they keep their
+# capacity and repeated encodes don't regrow a fresh multi-MB buffer each time.
+# The pool is capped, and buffers grown past the size limit by an unusually large
+# encode are dropped rather than pinned for the life of the process.
+_MAX_POOLED_ENCODE_BUFFERS = 4
+_MAX_POOLED_ENCODE_BUFFER_BYTES = 8 * 1024 * 1024
+_ENCODE_BUFFERS: "queue.SimpleQueue[io.BytesIO]" = queue.SimpleQueue()
+
 def convert_bgr_to_jpeg_bytes(img_bgr: np.ndarray, quality: int = 95) -> bytes:
     """Converts a BGR NumPy array to JPEG bytes in memory."""
     img_rgb = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2RGB)
-    buf = io.BytesIO()
-    Image.fromarray(img_rgb).save(buf, format="JPEG", quality=quality, optimize=True)
-    return buf.getvalue()
+    try:
+        buf = _ENCODE_BUFFERS.get_nowait()
+    except queue.Empty:
+        buf = io.BytesIO()
+    buffer_bytes = None  # Stays None if the encode fails; that buffer is dropped.
+    try:
+        buf.seek(0)
+        Image.fromarray(img_rgb).save(buf, format="JPEG", quality=quality, optimize=True)
+        size = buf.tell()
+        with buf.getbuffer() as view:
+            buffer_bytes = view.nbytes
+            return bytes(view[:size])
+    finally:
+        if (
+            buffer_bytes is not None
+            and buffer_bytes <= _MAX_POOLED_ENCODE_BUFFER_BYTES
+            and _ENCODE_BUFFERS.qsize() < _MAX_POOLED_ENCODE_BUFFERS
+        ):
+            _ENCODE_BUFFERS.put(buf)
 
 # --- Collage-Specific Helpers (logic that requires multiple images) ---
 
@@ -487,6 +512,51 @@ def stack_images_horizontally(
     return convert_bgr_to_jpeg_bytes(combined_image)
 
 
+def build_pair_composites(
+    mom_profile_bytes: bytes,
+    dad_profile_bytes: bytes,
+) -> Optional[Dict[str, bytes]]:
+    """
+    Builds the three horizontal parent composites from the two front+side profile images.
+
+    Equivalent to splitting each profile with `split_and_stack_image_bytes` and
+    combining the views with `stack_images_horizontally`, but each profile is decoded
+    once, its views are sliced in place, and each view is face-aligned once instead of
+    being re-encoded and re-decoded for every composite that uses it.
+
+    Args:
+        mom_profile_bytes: Bytes of the mother's front+side profile image.
+        dad_profile_bytes: Bytes of the father's front+side profile image.
+
+    Returns:
+        A dict with "mom_front_dad_front", "mom_front_dad_side" and "dad_front_mom_side"
+        JPEG bytes, or None on failure.
+    """
+    mom_img = load_image_bgr_from_bytes(mom_profile_bytes)
+    dad_img = load_image_bgr_from_bytes(dad_profile_bytes)
+
+    if mom_img is None or dad_img is None:
+        logger.error("Could not load one or both profile images for pair composites.")
+        return None
+
+    mom_mid, dad_mid = mom_img.shape[1] // 2, dad_img.shape[1] // 2
+    mom_front, mom_side, dad_front, dad_side = (
+        # Column slices are strided views; OpenCV and InsightFace expect contiguous buffers.
+        _align_and_standardize_face(np.ascontiguousarray(view), STANDARD_FACE_WIDTH, STANDARD_FACE_HEIGHT)
+        for view in (mom_img[:, :mom_mid], mom_img[:, mom_mid:], dad_img[:, :dad_mid], dad_img[:, dad_mid:])
+    )
+
+    if any(view is None for view in (mom_front, mom_side, dad_front, dad_side)):
+        logger.error("Face alignment failed for one or more views in pair composites.")
+        return None
+
+    return {
+        "mom_front_dad_front": convert_bgr_to_jpeg_bytes(np.hstack((mom_front, dad_front))),
+        "mom_front_dad_side": convert_bgr_to_jpeg_bytes(np.hstack((mom_front, dad_side))),
+        "dad_front_mom_side": convert_bgr_to_jpeg_bytes(np.hstack((dad_front, mom_side))),
+    }
+
+
 def stack_images_vertically(
     img_top_bytes: bytes,
     img_bottom_bytes: bytes,
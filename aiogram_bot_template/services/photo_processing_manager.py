@@ -1,10 +1,13 @@
 # aiogram_bot_template/services/photo_processing_manager.py
 import asyncio
 from multiprocessing import Pool
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, TYPE_CHECKING
 import numpy as np
 import structlog
 
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
 logger = structlog.get_logger(__name__)
 
 class PhotoProcessingManager:
@@ -20,6 +23,10 @@ class PhotoProcessingManager:
             pool: An instance of multiprocessing.Pool.
         """
         self._pool = pool
+        # In-flight centroid computations by cache key, shared by concurrent callers.
+        self._centroid_tasks: Dict[str, asyncio.Task] = {}
+        # In-flight composite renders by composite UID, shared by concurrent callers.
+        self._composite_tasks: Dict[str, asyncio.Task] = {}
         logger.info("PhotoProcessingManager initialized.")
 
     async def _run_in_worker(self, func, *args):
@@ -73,6 +80,50 @@ class PhotoProcessingManager:
             image_bytes_list
         )
         
+    async def get_or_compute_identity_centroid(
+        self, file_unique_ids: List[str], cache_pool: "Redis"
+    ) -> Optional[np.ndarray]:
+        """
+        Returns the identity centroid for a set of cached photos, reading it from Redis
+        when it was already computed (e.g. right after upload) and computing and
+        caching it otherwise. Concurrent calls for the same photos share one computation.
+
+        Args:
+            file_unique_ids: The cache UIDs of the processed photos of one person.
+            cache_pool: An async Redis connection pool.
+
+        Returns:
+            A numpy array for the centroid, or None.
+        """
+        from . import similarity_scorer
+        key = similarity_scorer.centroid_cache_key(file_unique_ids)
+
+        task = self._centroid_tasks.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load_or_compute_centroid(key, file_unique_ids, cache_pool))
+            self._centroid_tasks[key] = task
+            task.add_done_callback(lambda _: self._centroid_tasks.pop(key, None))
+        # Shielded so that one cancelled caller does not cancel the others' computation.
+        return await asyncio.shield(task)
+
+    async def _load_or_compute_centroid(
+        self, key: str, file_unique_ids: List[str], cache_pool: "Redis"
+    ) -> Optional[np.ndarray]:
+        """Reads the centroid cached under `key`, computing and caching it on a miss."""
+        from . import image_cache
+        cached_centroid = await cache_pool.get(key)
+        if cached_centroid:
+            logger.debug("Identity centroid cache hit.", key=key)
+            return np.frombuffer(cached_centroid, dtype=np.float32)
+
+        results = await image_cache.get_cached_image_bytes_many(file_unique_ids, cache_pool)
+        image_bytes_list = [b for b, _ in results if b is not None]
+        centroid = await self.calculate_identity_centroid(image_bytes_list)
+        if centroid is not None:
+            centroid = np.asarray(centroid, dtype=np.float32)
+            await cache_pool.set(key, centroid.tobytes(), ex=image_cache.CACHE_TTL_SECONDS)
+        return centroid
+
     async def sort_and_filter_by_identity(
         self, photos_data: List[Dict], target_count: int
     ) -> List[Dict]:
@@ -110,6 +161,23 @@ class PhotoProcessingManager:
             image_bytes
         )
 
+    async def extract_front_view_features(self, composite_bytes: bytes) -> Optional[dict]:
+        """
+        Offloads face feature extraction for the front half of a front/side composite
+        to a worker process, without splitting and re-encoding the composite first.
+
+        Args:
+            composite_bytes: The byte string of the front/side composite.
+
+        Returns:
+            A dictionary containing the face features, or None.
+        """
+        from . import photo_processor_service
+        return await self._run_in_worker(
+            photo_processor_service.extract_front_view_features_worker,
+            composite_bytes
+        )
+
     async def create_portrait_collage(self, tiles_bytes: List[bytes]) -> Optional[bytes]:
         """
         Offloads the creation of a 2x2 collage to a worker process.
@@ -153,6 +221,18 @@ class PhotoProcessingManager:
             img_left_bytes, img_right_bytes
         )
 
+    async def build_pair_composites(
+        self, mom_profile_bytes: bytes, dad_profile_bytes: bytes
+    ) -> Optional[Dict[str, bytes]]:
+        """
+        Offloads building all horizontal parent composites to a worker process.
+        """
+        from . import photo_processor_service
+        return await self._run_in_worker(
+            photo_processor_service.build_pair_composites_worker,
+            mom_profile_bytes, dad_profile_bytes
+        )
+
     async def stack_two_images(self, img_top_bytes: bytes, img_bottom_bytes: bytes) -> Optional[bytes]:
         """
         Offloads vertical image stacking to a worker process.
@@ -161,4 +241,65 @@ class PhotoProcessingManager:
         return await self._run_in_worker(
             photo_processor_service.stack_two_images_worker,
             img_top_bytes, img_bottom_bytes
-        )
\ No newline at end of file
+        )
+
+    async def stack_three_images(
+        self, img_top_bytes: bytes, img_middle_bytes: bytes, img_bottom_bytes: bytes
+    ) -> Optional[bytes]:
+        """
+        Offloads three-way vertical image stacking to a worker process.
+        """
+        from . import photo_processor_service
+        return await self._run_in_worker(
+            photo_processor_service.stack_three_images_worker,
+            img_top_bytes, img_middle_bytes, img_bottom_bytes
+        )
+
+    async def get_or_render_vertical_composite(
+        self, top_uid: str, bottom_uid: str, cache_pool: "Redis"
+    ) -> Optional[bytes]:
+        """
+        Returns the vertical composite of two cached images, reading it from Redis when
+        it was already rendered and rendering and caching it otherwise. Concurrent calls
+        for the same pair share one render.
+
+        Args:
+            top_uid: The cache UID of the top image.
+            bottom_uid: The cache UID of the bottom image.
+            cache_pool: An async Redis connection pool.
+
+        Returns:
+            The composite as JPEG bytes, or None if a source is missing or rendering fails.
+        """
+        from . import image_cache
+        key = image_cache.composite_uid(top_uid, bottom_uid)
+
+        task = self._composite_tasks.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load_or_render_composite(key, top_uid, bottom_uid, cache_pool))
+            self._composite_tasks[key] = task
+            task.add_done_callback(lambda _: self._composite_tasks.pop(key, None))
+        # Shielded so that one cancelled caller does not cancel the others' render.
+        return await asyncio.shield(task)
+
+    async def _load_or_render_composite(
+        self, key: str, top_uid: str, bottom_uid: str, cache_pool: "Redis"
+    ) -> Optional[bytes]:
+        """Reads the composite cached under `key`, rendering and caching it on a miss."""
+        from . import image_cache
+        composite_json, top_json, bottom_json = await cache_pool.mget(key, top_uid, bottom_uid)
+        if composite_json:
+            composite_bytes, _ = image_cache.decode_payload(key, composite_json)
+            if composite_bytes:
+                return composite_bytes
+
+        top_bytes, _ = image_cache.decode_payload(top_uid, top_json)
+        bottom_bytes, _ = image_cache.decode_payload(bottom_uid, bottom_json)
+        if not top_bytes or not bottom_bytes:
+            return None
+
+        logger.info("Rendering vertical composite.", key=key)
+        composite_bytes = await self.stack_two_images(top_bytes, bottom_bytes)
+        if composite_bytes:
+            await image_cache.cache_image_bytes(key, composite_bytes, "image/jpeg", cache_pool)
+        return composite_bytes
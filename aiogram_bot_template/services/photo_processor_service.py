@@ -78,6 +78,13 @@ def extract_face_features_worker(image_bytes: bytes) -> Optional[dict]:
     """
     return similarity_scorer._extract_face_features_sync(image_bytes)
 
+def extract_front_view_features_worker(composite_bytes: bytes) -> Optional[dict]:
+    """
+    Worker function to extract face features from the front half of a front/side composite.
+    Designed to run in a separate process.
+    """
+    return similarity_scorer.extract_front_view_features_sync(composite_bytes)
+
 def create_portrait_collage_worker(tiles_bytes: List[bytes]) -> Optional[bytes]:
     """
     Worker function to create a 2x2 collage from processed tiles.
@@ -99,9 +106,23 @@ def stack_images_horizontally_worker(img_left_bytes: bytes, img_right_bytes: byt
     """
     return photo_processing.stack_images_horizontally(img_left_bytes, img_right_bytes)
 
+def build_pair_composites_worker(mom_profile_bytes: bytes, dad_profile_bytes: bytes) -> Optional[Dict[str, bytes]]:
+    """
+    Worker function to build all horizontal parent composites in one pass.
+    Designed to run in a separate process.
+    """
+    return photo_processing.build_pair_composites(mom_profile_bytes, dad_profile_bytes)
+
 def stack_two_images_worker(img_top_bytes: bytes, img_bottom_bytes: bytes) -> Optional[bytes]:
     """
     Worker function to stack two images vertically.
     Designed to run in a separate process.
     """
-    return photo_processing.stack_two_images(img_top_bytes, img_bottom_bytes)
\ No newline at end of file
+    return photo_processing.stack_two_images(img_top_bytes, img_bottom_bytes)
+
+def stack_three_images_worker(img_top_bytes: bytes, img_middle_bytes: bytes, img_bottom_bytes: bytes) -> Optional[bytes]:
+    """
+    Worker function to stack three images vertically.
+    Designed to run in a separate process.
+    """
+    return photo_processing.stack_three_images(img_top_bytes, img_middle_bytes, img_bottom_bytes)
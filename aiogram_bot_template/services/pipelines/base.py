@@ -1,5 +1,7 @@
 # aiogram_bot_template/services/pipelines/base.py
+import asyncio
 from abc import ABC, abstractmethod
+from contextlib import suppress
 from typing import Any
 import structlog
 import asyncpg  # <-- NEW IMPORT
@@ -42,6 +44,35 @@ class BasePipeline(ABC):
         self.cache_pool = cache_pool
         self.photo_manager = photo_manager
         self.db_pool = db_pool  # <-- NEW ATTRIBUTE
+        self._status_task: asyncio.Task | None = None
+
+    def _status(self, text: str) -> asyncio.Task:
+        """
+        Schedules a status message update without blocking the pipeline.
+        Updates are chained so they are still shown in the order they were issued.
+        """
+        previous_task = self._status_task
+
+        async def _update_after_previous() -> None:
+            if previous_task:
+                with suppress(Exception):
+                    await previous_task
+            await self.update_status_func(text)
+
+        task = asyncio.create_task(_update_after_previous())
+        task.add_done_callback(self._on_status_done)
+        self._status_task = task
+        return task
+
+    def _on_status_done(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception():
+            self.log.warning("Status update failed.", exc_info=task.exception())
+
+    async def flush_status(self) -> None:
+        """Waits for any scheduled status updates to be delivered."""
+        if self._status_task:
+            with suppress(Exception):
+                await self._status_task
 
     @abstractmethod
     async def prepare_data(self) -> PipelineOutput:
@@ -55,10 +86,14 @@ class BasePipeline(ABC):
         self,
         pipeline_output: PipelineOutput,
         payload_override: dict | None = None,
+        report_status: bool = True,
     ) -> tuple[ai_service.GenerationResult | None, dict | None]:
         """
         Selects the AI client, adapts the payload based on config, and runs generation.
+        With `report_status=False` the AI service gets no status callback, so callers
+        running several generations at once can own progress reporting themselves.
         """
+        await self.flush_status()
         gen_type_enum = GenerationType(self.gen_data["type"])
         quality_level = self.gen_data["quality_level"]
         user_id = self.gen_data.get("user_id")
@@ -80,7 +115,7 @@ class BasePipeline(ABC):
         result, error_meta = await ai_service.generate_image_with_reference(
             payload,
             generation_ai_client,
-            status_callback=self.update_status_func,
+            status_callback=self.update_status_func if report_status else None,
             user_id=user_id,
         )
 
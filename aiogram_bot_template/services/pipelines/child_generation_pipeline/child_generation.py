@@ -1,12 +1,10 @@
 # aiogram_bot_template/services/pipelines/child_generation_pipeline/child_generation.py
 import asyncio
-import uuid
+import secrets
 import random
-import numpy as np
 from typing import List
 from aiogram.utils.i18n import gettext as _
-from aiogram_bot_template.services import image_cache, photo_processing
-from aiogram_bot_template.services import similarity_scorer
+from aiogram_bot_template.services import image_cache
 from aiogram_bot_template.services.enhancers import (
     parent_visual_enhancer,
     child_prompt_enhancer,
@@ -21,6 +19,12 @@ from ..base import BasePipeline, PipelineOutput
 from aiogram_bot_template.services.pipelines import PROMPT_CHILD_DEFAULT
 from aiogram_bot_template.services.photo_processing_manager import PhotoProcessingManager
 
+# Per-request image UIDs are built as f"{tag}_{request_id}" for each of these tags.
+_COMPOSITE_UID_TAGS = ("mom_front_dad_front", "mom_front_dad_side", "dad_front_mom_side")
+_SESSION_UID_TAGS = ("mom_profile", "dad_profile", *_COMPOSITE_UID_TAGS, "parent_front_side")
+# Session keys dropped from gen_data when their images have expired from the cache.
+_SESSION_UID_KEYS = tuple(f"{tag}_uid" for tag in _SESSION_UID_TAGS)
+
 
 class ChildGenerationPipeline(BasePipeline):
     """
@@ -36,7 +40,7 @@ class ChildGenerationPipeline(BasePipeline):
         Private helper to generate child prompts using the provided parent composite image.
         This is the part of the logic that runs regardless of session state.
         """
-        await self.update_status_func(_("Designing child's features... ✨"))
+        self._status(_("Designing child's features... ✨"))
 
         quality_level = self.gen_data.get("quality_level", 1)
         tier_config = settings.child_generation.tiers.get(quality_level)
@@ -128,6 +132,45 @@ class ChildGenerationPipeline(BasePipeline):
         metadata = { "completed_prompts": completed_prompts, 'image_reference_list': image_reference_list }
         return PipelineOutput(request_payload=request_payload, caption=None, metadata=metadata)
 
+    async def _get_session_composites(self) -> tuple[str, str, str] | None:
+        """
+        Returns the session's horizontal parent composite UIDs, building them from the
+        cached parent profiles when the session was started by a pipeline that does not
+        produce them (pair photo). FSM state can outlive the cache TTL; if the images
+        have expired, the session keys are dropped from gen_data and None is returned
+        so the full setup runs again.
+        """
+        composite_uids = [self.gen_data.get(f"{tag}_uid") for tag in _COMPOSITE_UID_TAGS]
+        if all(composite_uids) and all(await image_cache.exists_bulk(composite_uids, self.cache_pool)):
+            return tuple(composite_uids)
+
+        mom_profile_uid = self.gen_data.get("mom_profile_uid")
+        dad_profile_uid = self.gen_data.get("dad_profile_uid")
+        mom_profile_bytes = dad_profile_bytes = None
+        if mom_profile_uid and dad_profile_uid:
+            (mom_profile_bytes, _), (dad_profile_bytes, _) = await image_cache.get_cached_image_bytes_many(
+                [mom_profile_uid, dad_profile_uid], self.cache_pool
+            )
+        if not mom_profile_bytes or not dad_profile_bytes:
+            self.log.warning("Session parent images expired from cache. Rebuilding.",
+                             profile_uids=[mom_profile_uid, dad_profile_uid])
+            for key in _SESSION_UID_KEYS:
+                self.gen_data.pop(key, None)
+            return None
+
+        self.log.info("Building parent composites from session profiles.")
+        composites = await self.photo_manager.build_pair_composites(mom_profile_bytes, dad_profile_bytes)
+        if not composites:
+            raise ValueError("Failed to build parent composites.")
+
+        request_id_str = self.gen_data.get("request_id") or secrets.token_hex(8)
+        self.gen_data["request_id"] = request_id_str
+        uids = {tag: f"{tag}_{request_id_str}" for tag in _COMPOSITE_UID_TAGS}
+        await image_cache.cache_image_bytes_bulk(
+            [(uids[tag], composites[tag], "image/jpeg") for tag in _COMPOSITE_UID_TAGS], self.cache_pool
+        )
+        return tuple(uids[tag] for tag in _COMPOSITE_UID_TAGS)
+
     async def prepare_data(self) -> PipelineOutput:
         """
         Prepares data for child generation. Checks for existing session data first.
@@ -135,12 +178,14 @@ class ChildGenerationPipeline(BasePipeline):
         # --- NEW: Get user_id for logging ---
         user_id = self.gen_data.get("user_id")
 
+        session_composites = None
         if "parent_front_side_uid" in self.gen_data:
+            session_composites = await self._get_session_composites()
+
+        if session_composites:
             self.log.info("Reusing existing parent composite for session action.")
             parent_front_side_uid = self.gen_data["parent_front_side_uid"]
-            mom_front_dad_front_uid = self.gen_data["mom_front_dad_front_uid"]
-            mom_front_dad_side_uid = self.gen_data["mom_front_dad_side_uid"]
-            dad_front_mom_side_uid = self.gen_data["dad_front_mom_side_uid"]
+            mom_front_dad_front_uid, mom_front_dad_side_uid, dad_front_mom_side_uid = session_composites
 
             mom_front_dad_front_url = image_cache.get_cached_image_proxy_url(mom_front_dad_front_uid)
             mom_front_dad_side_url = image_cache.get_cached_image_proxy_url(mom_front_dad_side_uid)
@@ -158,7 +203,7 @@ class ChildGenerationPipeline(BasePipeline):
             return output
 
         self.log.info("No session data found. Performing full initial setup for child generation.")
-        await self.update_status_func(_("Analyzing parental features... 🧬"))
+        self._status(_("Analyzing parental features... 🧬"))
 
         photos_collected = self.gen_data.get("photos_collected", [])
         mom_photos = [p for p in photos_collected if p.get("role") == ImageRole.MOTHER.value]
@@ -170,21 +215,17 @@ class ChildGenerationPipeline(BasePipeline):
         if not mom_collage_uid or not dad_collage_uid:
             raise ValueError("Could not find parent collage UIDs in state.")
 
-        # Calculate centroids (still needed for visual enhancer)
-        async def get_all_processed_bytes(photos):
-            tasks = [image_cache.get_cached_image_bytes(p["file_unique_id"], self.cache_pool) for p in photos]
-            results = await asyncio.gather(*tasks)
-            return [b for b, a in results if b is not None]
-
-        mother_bytes_list = await get_all_processed_bytes(mom_photos)
-        father_bytes_list = await get_all_processed_bytes(dad_photos)
-        
+        # Centroids (still needed for visual enhancer) are usually precomputed at upload time.
         mom_centroid, dad_centroid = await asyncio.gather(
-            self.photo_manager.calculate_identity_centroid(mother_bytes_list),
-            self.photo_manager.calculate_identity_centroid(father_bytes_list)
+            self.photo_manager.get_or_compute_identity_centroid(
+                [p["file_unique_id"] for p in mom_photos], self.cache_pool
+            ),
+            self.photo_manager.get_or_compute_identity_centroid(
+                [p["file_unique_id"] for p in dad_photos], self.cache_pool
+            ),
         )
         
-        await self.update_status_func(_("Creating visual identities for the AI... 🧑‍🎨"))
+        self._status(_("Creating visual identities for the AI... 🧑‍🎨"))
 
         visual_tasks = [
             parent_visual_enhancer.get_parent_visual_representation(
@@ -194,49 +235,47 @@ class ChildGenerationPipeline(BasePipeline):
                 dad_collage_uid, role="father", identity_centroid=dad_centroid, cache_pool=self.cache_pool, photo_manager=self.photo_manager, user_id=user_id
             ),
         ]
-        mom_profile_bytes, dad_profile_bytes = await asyncio.gather(*visual_tasks)
+        # One parent failing must not cancel the other's (expensive) generation.
+        mom_profile_bytes, dad_profile_bytes = await asyncio.gather(*visual_tasks, return_exceptions=True)
+        for role, result in (("mother", mom_profile_bytes), ("father", dad_profile_bytes)):
+            if isinstance(result, BaseException):
+                raise ValueError(f"Visual representation for {role} failed.") from result
+            if not result:
+                raise ValueError(f"Could not create a visual representation for {role}.")
         
-        request_id_str = self.gen_data.get("request_id", uuid.uuid4().hex)
-
-        mom_profile_uid = f"mom_profile_{request_id_str}"
-        await image_cache.cache_image_bytes(mom_profile_uid, mom_profile_bytes, "image/jpeg", self.cache_pool)
-        dad_profile_uid = f"dad_profile_{request_id_str}"
-        await image_cache.cache_image_bytes(dad_profile_uid, dad_profile_bytes, "image/jpeg", self.cache_pool)
-
-        mom_front_bytes, mom_side_bytes = await self.photo_manager.split_and_stack_image(mom_profile_bytes)
-        dad_front_bytes, dad_side_bytes = await self.photo_manager.split_and_stack_image(dad_profile_bytes)
-
-        mom_front_dad_front_bytes = await self.photo_manager.stack_images_horizontally(mom_front_bytes, dad_front_bytes)
-        mom_front_dad_front_uid = f"mom_front_dad_front_{request_id_str}"
-        await image_cache.cache_image_bytes(mom_front_dad_front_uid, mom_front_dad_front_bytes, "image/jpeg", self.cache_pool)
-        mom_front_dad_front_url = image_cache.get_cached_image_proxy_url(mom_front_dad_front_uid)
+        request_id_str = self.gen_data.get("request_id") or secrets.token_hex(8)
+        self.gen_data["request_id"] = request_id_str
 
-        mom_front_dad_side_bytes = await self.photo_manager.stack_images_horizontally(mom_front_bytes, dad_side_bytes)
-        mom_front_dad_side_uid = f"mom_front_dad_side_{request_id_str}"
-        await image_cache.cache_image_bytes(mom_front_dad_side_uid, mom_front_dad_side_bytes, "image/jpeg", self.cache_pool)
-        mom_front_dad_side_url = image_cache.get_cached_image_proxy_url(mom_front_dad_side_uid)
+        uids = {tag: f"{tag}_{request_id_str}" for tag in _SESSION_UID_TAGS}
 
-        dad_front_mom_side_bytes = await self.photo_manager.stack_images_horizontally(dad_front_bytes, mom_side_bytes)
-        dad_front_mom_side_uid = f"dad_front_mom_side_{request_id_str}"
-        await image_cache.cache_image_bytes(dad_front_mom_side_uid, dad_front_mom_side_bytes, "image/jpeg", self.cache_pool)
-        dad_front_mom_side_url = image_cache.get_cached_image_proxy_url(dad_front_mom_side_uid)
-
-        parent_front_side_bytes = await self.photo_manager.stack_two_images(mom_profile_bytes, dad_profile_bytes)
-        parent_front_side_uid = f"parent_front_side_{request_id_str}"
-        await image_cache.cache_image_bytes(parent_front_side_uid, parent_front_side_bytes, "image/jpeg", self.cache_pool)
+        composites, parent_front_side_bytes = await asyncio.gather(
+            self.photo_manager.build_pair_composites(mom_profile_bytes, dad_profile_bytes),
+            self.photo_manager.stack_two_images(mom_profile_bytes, dad_profile_bytes),
+        )
+        if not composites:
+            raise ValueError("Failed to build parent composites.")
+        images = {
+            "mom_profile": mom_profile_bytes,
+            "dad_profile": dad_profile_bytes,
+            **composites,
+            "parent_front_side": parent_front_side_bytes,
+        }
 
-        output = await self._prepare_child_prompts(mom_front_dad_front_url, mom_front_dad_side_url, dad_front_mom_side_url)
+        # All six images are independent; write them in one pipelined round-trip.
+        await image_cache.cache_image_bytes_bulk(
+            [(uids[tag], images[tag], "image/jpeg") for tag in _SESSION_UID_TAGS],
+            self.cache_pool,
+        )
+        composite_uids = [uids[tag] for tag in _COMPOSITE_UID_TAGS]
+        output = await self._prepare_child_prompts(
+            *(image_cache.get_cached_image_proxy_url(uid) for uid in composite_uids)
+        )
         
         output.metadata.update({
             "mom_collage_uid": mom_collage_uid,
             "dad_collage_uid": dad_collage_uid,
-            "mom_profile_uid": mom_profile_uid,
-            "dad_profile_uid": dad_profile_uid,
-            "mom_front_dad_front_uid": mom_front_dad_front_uid,
-            "mom_front_dad_side_uid": mom_front_dad_side_uid,
-            "dad_front_mom_side_uid": dad_front_mom_side_uid,
-            "parent_front_side_uid": parent_front_side_uid,
-            "processed_uids": [ mom_front_dad_front_uid, mom_front_dad_side_uid, dad_front_mom_side_uid ]
+            **{f"{tag}_uid": uid for tag, uid in uids.items()},
+            "processed_uids": composite_uids,
         })
         
         return output
\ No newline at end of file
@@ -1,13 +1,14 @@
 # aiogram_bot_template/services/pipelines/family_photo_pipeline/family_photo.py
 import asyncio
-import uuid
 import random
+import secrets
 from aiogram.utils.i18n import gettext as _
 
-from aiogram_bot_template.services import image_cache, photo_processing
+from aiogram_bot_template.services import image_cache
 from aiogram_bot_template.data.settings import settings
 from aiogram_bot_template.data.constants import GenerationType, ImageRole
 from ..base import BasePipeline, PipelineOutput
+from ..prompt_template import fill_placeholders
 from .family_default import PROMPT_FAMILY_DEFAULT
 from . import styles as family_styles
 
@@ -21,7 +22,7 @@ class FamilyPhotoPipeline(BasePipeline):
         if not selected_style_id:
             raise ValueError("Family photo style ID is missing from FSM data.")
 
-        await self.update_status_func(_("Assembling the family for the portrait... 👨‍👩‍👧"))
+        self._status(_("Assembling the family for the portrait... 👨‍👩‍👧"))
         
         photos_collected = self.gen_data.get("photos_collected", [])
         if len(photos_collected) < 3:
@@ -49,15 +50,18 @@ class FamilyPhotoPipeline(BasePipeline):
         if not all([mother_bytes, father_bytes, child_bytes]):
             raise ValueError("Could not retrieve all necessary image bytes from cache.")
         
-        request_id_str = self.gen_data.get('request_id', uuid.uuid4().hex)
+        request_id_str = self.gen_data.get("request_id") or secrets.token_hex(8)
+        self.gen_data["request_id"] = request_id_str
         
-        composite_bytes = photo_processing.stack_three_images(mother_bytes, father_bytes, child_bytes)
+        composite_bytes = await self.photo_manager.stack_three_images(mother_bytes, father_bytes, child_bytes)
+        if not composite_bytes:
+            raise ValueError("Failed to build the family composite.")
         composite_uid = f"family_composite_{request_id_str}"
         await image_cache.cache_image_bytes(composite_uid, composite_bytes, "image/jpeg", self.cache_pool)
         composite_url = image_cache.get_cached_image_proxy_url(composite_uid)
 
         # --- Style and Prompt Generation Logic ---
-        await self.update_status_func(_("Designing your photoshoot... 🎨"))
+        self._status(_("Designing your photoshoot... 🎨"))
         
         quality_level = self.gen_data.get("quality_level", 1)
         tier_config = settings.family_photo.tiers.get(quality_level)
@@ -80,17 +84,12 @@ class FamilyPhotoPipeline(BasePipeline):
         
         completed_prompts = []
         image_reference_list = []
+        values = {"STYLE_NAME": style_name, "STYLE_DEFINITION": style_definition}
         for scene_name in selected_scenes:
-            framing_block = framing_options.get(scene_name, framing_options[framing_keys[0]])
-            style_block = style_options.get(scene_name, style_options[framing_keys[0]])
-
-            final_prompt = PROMPT_FAMILY_DEFAULT
-            final_prompt = final_prompt.replace("{{STYLE_NAME}}", style_name)
-            final_prompt = final_prompt.replace("{{STYLE_DEFINITION}}", style_definition)
-            final_prompt = final_prompt.replace("{{SCENE_NAME}}", scene_name)
-            final_prompt = final_prompt.replace("{{FRAMING_OPTIONS}}", framing_block)
-            final_prompt = final_prompt.replace("{{STYLE_OPTIONS}}", style_block)
-            completed_prompts.append(final_prompt)
+            values["SCENE_NAME"] = scene_name
+            values["FRAMING_OPTIONS"] = framing_options[scene_name]
+            values["STYLE_OPTIONS"] = style_options[scene_name]
+            completed_prompts.append(fill_placeholders(PROMPT_FAMILY_DEFAULT, values))
             image_reference_list.append(composite_url)
 
         request_payload = {
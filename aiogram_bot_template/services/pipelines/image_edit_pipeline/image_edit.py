@@ -63,9 +63,9 @@ class ImageEditPipeline(BasePipeline):
         is_reframe_task = self.gen_data.get("is_reframe", False)
         
         if is_reframe_task:
-            await self.update_status_func(_("Preparing your image for reframing..."))
+            self._status(_("Preparing your image for reframing..."))
         else:
-            await self.update_status_func(_("Preparing your image for editing..."))
+            self._status(_("Preparing your image for editing..."))
 
         source_generation_id = self.gen_data.get("source_generation_id")
         if not source_generation_id:
@@ -14,11 +14,11 @@ IDENTITY — lock from the two views per person:
 • Strictly preserve prescription glasses from the reference. Keep existing prescription glasses; **do not add new ones if absent.**
 • Don’t change age/weight; don’t beautify; don’t smooth skin; don’t alter head-size ratio between people.
 
-FRAMING — {{STYLE_NAME}} “{{SCENE_NAME}}” (single frame)
-{{FRAMING_OPTIONS}}
+FRAMING — {STYLE_NAME} “{SCENE_NAME}” (single frame)
+{FRAMING_OPTIONS}
 
-STYLE — {{STYLE_DEFINITION}}, {{SCENE_NAME}}
-{{STYLE_OPTIONS}}
+STYLE — {STYLE_DEFINITION}, {SCENE_NAME}
+{STYLE_OPTIONS}
 
 GAZE — lock precise alignment: for each person both eyes converge to the same target, pupils equal size with single mirrored catchlights; forbid divergent/crossed gaze, misaligned irises, or inconsistent catchlight positions.
 
@@ -1,20 +1,27 @@
 # aiogram_bot_template/services/pipelines/pair_photo_pipeline/pair_photo.py
 import asyncio
-import uuid
-import random
-import numpy as np
+import secrets
+from typing import TYPE_CHECKING
 from aiogram.utils.i18n import gettext as _
 
-from aiogram_bot_template.services import image_cache, photo_processing
+from aiogram_bot_template.services import image_cache
 from aiogram_bot_template.services import similarity_scorer
 from aiogram_bot_template.services.enhancers import parent_visual_enhancer
 from aiogram_bot_template.data.settings import settings
 from aiogram_bot_template.data.constants import GenerationType, ImageRole
 from ..base import BasePipeline, PipelineOutput
-from .pair_default import PROMPT_PAIR_DEFAULT
 from . import styles
 from aiogram_bot_template.services.photo_processing_manager import PhotoProcessingManager
 
+if TYPE_CHECKING:
+    import numpy as np
+
+# Per-request image UIDs are built as f"{tag}_{request_id}" for each of these tags.
+# The horizontal front/side composites are only used by child generation, which builds
+# them from these profiles on demand.
+_SESSION_UID_TAGS = ("mom_profile", "dad_profile")
+# Session keys that must all still be cached for the reuse path to be taken.
+_REUSE_UID_KEYS = ("mom_profile_uid", "dad_profile_uid")
 
 class PairPhotoPipeline(BasePipeline):
     """
@@ -25,60 +32,29 @@ class PairPhotoPipeline(BasePipeline):
     def __init__(self, *args, photo_manager: PhotoProcessingManager, **kwargs):
         super().__init__(*args, photo_manager=photo_manager, **kwargs)
 
-    async def _prepare_styled_pair_prompts(
+    def _prepare_styled_pair_prompts(
         self, parent_front_side_url: str, style_id: str
     ) -> PipelineOutput:
         """
         Private helper to generate styled pair photo prompts using the provided
-        parent composite and selected style.
+        parent composite and selected style. Pure CPU work: the status update is
+        scheduled without awaiting, so this runs synchronously.
         """
-        await self.update_status_func(_("Designing your photoshoot... 🎨"))
+        self._status(_("Designing your photoshoot... 🎨"))
         
         quality_level = self.gen_data.get("quality_level", 1)
         tier_config = settings.pair_photo.tiers.get(quality_level)
         if not tier_config:
             raise ValueError(f"Tier configuration for pair_photo level {quality_level} not found.")
 
-        style_info = styles.STYLES.get(style_id)
-        if not style_info:
+        compiled_style = styles.get_compiled_style(style_id)
+        if not compiled_style:
             raise ValueError(f"Style '{style_id}' not found in the style registry.")
 
-        style_module = style_info["module"]
-        style_name = style_module.STYLE_NAME
-        style_definition = style_module.STYLE_DEFINITION
-        framing_options = style_module.FRAMING_OPTIONS
-        style_options = style_module.STYLE_OPTIONS
-
-        num_generations = tier_config.count
-        
-        framing_keys = list(framing_options.keys())
-        selected_scenes = random.choices(framing_keys, k=num_generations)
-        selected_scenes = framing_keys
-
-        self.log.info("framing_keys: ", framing_keys=framing_keys)
-        self.log.info("selected_scenes: ", selected_scenes=selected_scenes)      
-
-        completed_prompts = []
-        image_reference_list = []
-        for scene_name in selected_scenes:
-            framing_block = framing_options.get(scene_name)
-            style_block = style_options.get(scene_name)
-
-            if not framing_block or not style_block:
-                self.log.warning("Mismatch between FRAMING and STYLE keys for scene", scene=scene_name)
-                fallback_key = framing_keys[0]
-                framing_block = framing_options[fallback_key]
-                style_block = style_options[fallback_key]
-
-            final_prompt = PROMPT_PAIR_DEFAULT
-            final_prompt = final_prompt.replace("{{STYLE_NAME}}", style_name)
-            final_prompt = final_prompt.replace("{{STYLE_DEFINITION}}", style_definition)
-            final_prompt = final_prompt.replace("{{SCENE_NAME}}", scene_name)
-            final_prompt = final_prompt.replace("{{FRAMING_OPTIONS}}", framing_block)
-            final_prompt = final_prompt.replace("{{STYLE_OPTIONS}}", style_block)
-            completed_prompts.append(final_prompt)
-
-            image_reference_list.append(parent_front_side_url)
+        # Every scene of the style is generated; its prompts are rendered once per process.
+        selected_scenes, completed_prompts = compiled_style
+        self.log.debug("Selected scenes for pair photo.", selected_scenes=selected_scenes)
+        image_reference_list = (parent_front_side_url,) * len(completed_prompts)
 
         request_payload = {
             "model": tier_config.model,
@@ -92,6 +68,45 @@ class PairPhotoPipeline(BasePipeline):
         metadata = {"completed_prompts": completed_prompts, "image_reference_list": image_reference_list}
         return PipelineOutput(request_payload=request_payload, caption=None, metadata=metadata)
 
+    async def _session_profiles_cached(self) -> bool:
+        """
+        Checks that the parent profiles referenced by the FSM session still exist in Redis.
+        FSM state can outlive the cache TTL; if any profile has expired, the session
+        keys are dropped from gen_data so the full setup runs again.
+        """
+        session_uids = [self.gen_data.get(key) for key in _REUSE_UID_KEYS]
+        present = await image_cache.exists_bulk(
+            [uid for uid in session_uids if uid], self.cache_pool
+        )
+        if all(session_uids) and all(present):
+            return True
+
+        self.log.warning("Session profiles expired from cache. Rebuilding.", uids=session_uids)
+        for key in _REUSE_UID_KEYS:
+            self.gen_data.pop(key, None)
+        return False
+
+    async def _render_parent_composite(self, mom_profile_uid: str, dad_profile_uid: str) -> None:
+        """
+        Renders and caches the vertical parent composite before any frame is submitted.
+        Concurrent frames then all hit the proxy cache, and the debug sender finds the
+        composite in Redis.
+        """
+        composite_bytes = await self.photo_manager.get_or_render_vertical_composite(
+            mom_profile_uid, dad_profile_uid, self.cache_pool
+        )
+        if not composite_bytes:
+            raise ValueError("Could not render the parent composite.")
+
+    async def _get_identity_centroid(self, state_key: str, photos: list[dict]) -> "np.ndarray | None":
+        """Returns the centroid persisted in FSM under `state_key`, computing it only when absent."""
+        centroid = similarity_scorer.decode_centroid(self.gen_data.get(state_key))
+        if centroid is not None:
+            return centroid
+        return await self.photo_manager.get_or_compute_identity_centroid(
+            [p["file_unique_id"] for p in photos], self.cache_pool
+        )
+
     async def prepare_data(self) -> PipelineOutput:
         """
         Prepares data for pair photo generation. Checks for existing session data first.
@@ -103,19 +118,16 @@ class PairPhotoPipeline(BasePipeline):
         if not selected_style_id:
             raise ValueError("Pair photo style ID is missing from FSM data.")
 
-        if "parent_front_side_uid" in self.gen_data:
-            self.log.info("Reusing existing parent composite for session action.")
-            parent_front_side_uid = self.gen_data["parent_front_side_uid"]
-            mom_front_dad_front_uid = self.gen_data["mom_front_dad_front_uid"]
-            mom_front_dad_side_uid = self.gen_data["mom_front_dad_side_uid"]
-            dad_front_mom_side_uid = self.gen_data["dad_front_mom_side_uid"]
+        if "mom_profile_uid" in self.gen_data and await self._session_profiles_cached():
+            self.log.info("Reusing existing parent profiles for session action.")
+            mom_profile_uid = self.gen_data["mom_profile_uid"]
+            dad_profile_uid = self.gen_data["dad_profile_uid"]
 
-            parent_front_side_url = image_cache.get_cached_image_proxy_url(parent_front_side_uid)
+            await self._render_parent_composite(mom_profile_uid, dad_profile_uid)
+            parent_front_side_uid = image_cache.composite_uid(mom_profile_uid, dad_profile_uid)
+            parent_front_side_url = image_cache.get_composite_proxy_url(mom_profile_uid, dad_profile_uid)
             
-            output = await self._prepare_styled_pair_prompts(parent_front_side_url, selected_style_id)
-            output.metadata["mom_front_dad_front_uid"] = mom_front_dad_front_uid
-            output.metadata["mom_front_dad_side_uid"] = mom_front_dad_side_uid
-            output.metadata["dad_front_mom_side_uid"] = dad_front_mom_side_uid
+            output = self._prepare_styled_pair_prompts(parent_front_side_url, selected_style_id)
             output.metadata["parent_front_side_uid"] = parent_front_side_uid
             output.metadata["processed_uids"] = [ parent_front_side_uid ]
             # Also pass collage UIDs for session consistency
@@ -124,11 +136,17 @@ class PairPhotoPipeline(BasePipeline):
             return output
         
         self.log.info("No session data found. Performing full initial setup for pair photo.")
-        await self.update_status_func(_("Analyzing your photos and preparing portraits... 🧬"))
+        self._status(_("Analyzing your photos and preparing portraits... 🧬"))
 
         photos_collected = self.gen_data.get("photos_collected", [])
-        mom_photos = [p for p in photos_collected if p.get("role") == ImageRole.MOTHER.value]
-        dad_photos = [p for p in photos_collected if p.get("role") == ImageRole.FATHER.value]
+        mom_role, dad_role = ImageRole.MOTHER.value, ImageRole.FATHER.value
+        mom_photos, dad_photos = [], []
+        for p in photos_collected:
+            role = p.get("role")
+            if role == mom_role:
+                mom_photos.append(p)
+            elif role == dad_role:
+                dad_photos.append(p)
         
         mom_collage_uid = self.gen_data.get("mother_collage_uid")
         dad_collage_uid = self.gen_data.get("father_collage_uid")
@@ -136,21 +154,18 @@ class PairPhotoPipeline(BasePipeline):
         if not mom_collage_uid or not dad_collage_uid:
             raise ValueError("Could not find parent collage UIDs in state.")
 
-        # Calculate centroids (still needed for visual enhancer)
-        async def get_all_processed_bytes(photos):
-            tasks = [image_cache.get_cached_image_bytes(p["file_unique_id"], self.cache_pool) for p in photos]
-            results = await asyncio.gather(*tasks)
-            return [b for b, a in results if b is not None]
+        request_id_str = self.gen_data.get("request_id") or secrets.token_hex(8)
+        self.gen_data["request_id"] = request_id_str
+        uids = {tag: f"{tag}_{request_id_str}" for tag in _SESSION_UID_TAGS}
 
-        mother_bytes_list = await get_all_processed_bytes(mom_photos)
-        father_bytes_list = await get_all_processed_bytes(dad_photos)
-        
+        # Centroids (still needed for visual enhancer) come from a previous session run,
+        # or were precomputed at upload time.
         mom_centroid, dad_centroid = await asyncio.gather(
-            self.photo_manager.calculate_identity_centroid(mother_bytes_list),
-            self.photo_manager.calculate_identity_centroid(father_bytes_list)
+            self._get_identity_centroid("mom_centroid", mom_photos),
+            self._get_identity_centroid("dad_centroid", dad_photos),
         )
         
-        await self.update_status_func(_("Creating visual identities for the AI... 🧑‍🎨"))
+        self._status(_("Creating visual identities for the AI... 🧑‍🎨"))
 
         visual_tasks = [
             parent_visual_enhancer.get_parent_visual_representation(
@@ -160,47 +175,39 @@ class PairPhotoPipeline(BasePipeline):
                 dad_collage_uid, role="father", identity_centroid=dad_centroid, cache_pool=self.cache_pool, photo_manager=self.photo_manager, user_id=user_id
             ),
         ]
-        mom_profile_bytes, dad_profile_bytes = await asyncio.gather(*visual_tasks)
+        # One parent failing must not cancel the other's (expensive) generation.
+        mom_profile_bytes, dad_profile_bytes = await asyncio.gather(*visual_tasks, return_exceptions=True)
+        for role, result in (("mother", mom_profile_bytes), ("father", dad_profile_bytes)):
+            if isinstance(result, BaseException):
+                raise ValueError(f"Visual representation for {role} failed.") from result
+            if not result:
+                raise ValueError(f"Could not create a visual representation for {role}.")
         
-        request_id_str = self.gen_data.get("request_id", uuid.uuid4().hex)
-
-        mom_profile_uid = f"mom_profile_{request_id_str}"
-        await image_cache.cache_image_bytes(mom_profile_uid, mom_profile_bytes, "image/jpeg", self.cache_pool)
-        dad_profile_uid = f"dad_profile_{request_id_str}"
-        await image_cache.cache_image_bytes(dad_profile_uid, dad_profile_bytes, "image/jpeg", self.cache_pool)
-
-        mom_front_bytes, mom_side_bytes = await self.photo_manager.split_and_stack_image(mom_profile_bytes)
-        dad_front_bytes, dad_side_bytes = await self.photo_manager.split_and_stack_image(dad_profile_bytes)
-
-        mom_front_dad_front_bytes = await self.photo_manager.stack_images_horizontally(mom_front_bytes, dad_front_bytes)
-        mom_front_dad_front_uid = f"mom_front_dad_front_{request_id_str}"
-        await image_cache.cache_image_bytes(mom_front_dad_front_uid, mom_front_dad_front_bytes, "image/jpeg", self.cache_pool)
-
-        mom_front_dad_side_bytes = await self.photo_manager.stack_images_horizontally(mom_front_bytes, dad_side_bytes)
-        mom_front_dad_side_uid = f"mom_front_dad_side_{request_id_str}"
-        await image_cache.cache_image_bytes(mom_front_dad_side_uid, mom_front_dad_side_bytes, "image/jpeg", self.cache_pool)
-
-        dad_front_mom_side_bytes = await self.photo_manager.stack_images_horizontally(dad_front_bytes, mom_side_bytes)
-        dad_front_mom_side_uid = f"dad_front_mom_side_{request_id_str}"
-        await image_cache.cache_image_bytes(dad_front_mom_side_uid, dad_front_mom_side_bytes, "image/jpeg", self.cache_pool)
-
-        parent_front_side_bytes = await self.photo_manager.stack_two_images(mom_profile_bytes, dad_profile_bytes)
-        parent_front_side_uid = f"parent_front_side_{request_id_str}"
-        await image_cache.cache_image_bytes(parent_front_side_uid, parent_front_side_bytes, "image/jpeg", self.cache_pool)
-        parent_front_side_url = image_cache.get_cached_image_proxy_url(parent_front_side_uid)
-
-        output = await self._prepare_styled_pair_prompts(parent_front_side_url, selected_style_id)
+        await image_cache.cache_image_bytes_bulk(
+            [
+                (uids["mom_profile"], mom_profile_bytes, "image/jpeg"),
+                (uids["dad_profile"], dad_profile_bytes, "image/jpeg"),
+            ],
+            self.cache_pool,
+        )
+        # Everything below works from cached UIDs; release the image buffers before the next awaits.
+        del mom_profile_bytes, dad_profile_bytes
+        # The proxy serves the vertical parent composite from its cache under parent_front_side_uid.
+        await self._render_parent_composite(uids["mom_profile"], uids["dad_profile"])
+        uids["parent_front_side"] = image_cache.composite_uid(uids["mom_profile"], uids["dad_profile"])
+        parent_front_side_url = image_cache.get_composite_proxy_url(uids["mom_profile"], uids["dad_profile"])
+
+        output = self._prepare_styled_pair_prompts(parent_front_side_url, selected_style_id)
         
         output.metadata.update({
             "mom_collage_uid": mom_collage_uid,
             "dad_collage_uid": dad_collage_uid,
-            "mom_profile_uid": mom_profile_uid,
-            "dad_profile_uid": dad_profile_uid,
-            "mom_front_dad_front_uid": mom_front_dad_front_uid,
-            "mom_front_dad_side_uid": mom_front_dad_side_uid,
-            "dad_front_mom_side_uid": dad_front_mom_side_uid,
-            "parent_front_side_uid": parent_front_side_uid,
-            "processed_uids": [ parent_front_side_uid ]
+            "mom_profile_uid": uids["mom_profile"],
+            "dad_profile_uid": uids["dad_profile"],
+            "parent_front_side_uid": uids["parent_front_side"],
+            "processed_uids": [ uids["parent_front_side"] ],
+            "mom_centroid": similarity_scorer.encode_centroid(mom_centroid),
+            "dad_centroid": similarity_scorer.encode_centroid(dad_centroid),
         })
         
         return output
\ No newline at end of file
@@ -1,32 +1,47 @@
-# aiogram_bot_template/services/pipelines/family_photo_pipeline/styles/__init__.py
-import importlib
-import pkgutil
-from typing import Dict, Any
+# aiogram_bot_template/services/pipelines/pair_photo_pipeline/styles/__init__.py
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 
-# A dictionary to hold all discovered style modules
-STYLES: Dict[str, Dict[str, Any]] = {}
-
-def _register_styles():
-    """Dynamically imports and registers all style modules in this package."""
-    package_path = __path__
-    package_name = __name__
+from ...style_registry import discover_styles
+from ..pair_default import PROMPT_PAIR_DEFAULT
 
-    for _, module_name, _ in pkgutil.iter_modules(package_path):
-        # Dynamically import the module
-        module = importlib.import_module(f".{module_name}", package_name)
-
-        # Check for required attributes in the module
-        style_id = getattr(module, "STYLE_NAME", "").upper().replace(" ", "_")
-        style_name_display = getattr(module, "STYLE_NAME", None)
-        preview_image_filename = f"{module_name}.png"
+# A dictionary to hold all discovered style modules
+STYLES: Dict[str, Dict[str, Any]] = discover_styles(__path__, __name__)
 
-        if style_id and style_name_display:
-            STYLES[style_id] = {
-                "id": style_id,
-                "name": style_name_display,
-                "module": module,
-                "preview_image": preview_image_filename
-            }
+def _compile_scene_blocks(module) -> Dict[str, Tuple[str, str]]:
+    """
+    Pairs each scene's FRAMING and STYLE blocks. A scene with an empty block
+    falls back to the first scene's pair.
+    """
+    framing_options, style_options = module.FRAMING_OPTIONS, module.STYLE_OPTIONS
+    first_key = next(iter(framing_options))
+    fallback = (framing_options[first_key], style_options[first_key])
+    return {
+        scene: (framing, style_options[scene]) if framing and style_options[scene] else fallback
+        for scene, framing in framing_options.items()
+    }
 
-# Discover and register styles upon import of this package
-_register_styles()
\ No newline at end of file
+@lru_cache(maxsize=None)
+def get_compiled_style(style_id: str) -> Optional[Tuple[Tuple[str, ...], Tuple[str, ...]]]:
+    """
+    Returns a style's scene names and the fully rendered pair prompt for each scene.
+    Prompts depend only on the style module, so they are rendered once on first use
+    and memoized; styles nobody picks are never rendered.
+    """
+    info = STYLES.get(style_id)
+    if info is None:
+        return None
+    module = info["module"]
+    scene_blocks = _compile_scene_blocks(module)
+    scene_names = tuple(scene_blocks)
+    prompts = tuple(
+        PROMPT_PAIR_DEFAULT.format_map({
+            "STYLE_NAME": module.STYLE_NAME,
+            "STYLE_DEFINITION": module.STYLE_DEFINITION,
+            "SCENE_NAME": scene_name,
+            "FRAMING_OPTIONS": framing_block,
+            "STYLE_OPTIONS": style_block,
+        })
+        for scene_name, (framing_block, style_block) in scene_blocks.items()
+    )
+    return scene_names, prompts
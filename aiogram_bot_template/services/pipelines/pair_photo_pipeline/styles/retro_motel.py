@@ -1,4 +1,4 @@
-# aiogram_bot_template/services/pipelines/pair_photo_pipeline/styles/retro_motel_1950s_pastel.py
+# aiogram_bot_template/services/pipelines/pair_photo_pipeline/styles/retro_motel.py
 
 STYLE_NAME = "RETRO MOTEL 1950s"
 STYLE_DEFINITION = "Mid-century American roadside motel aesthetic in soft pastel colors"
@@ -170,37 +170,28 @@ Negative constraints: no finger interlacing; no readable logos/plates; no faces
 
 }
 
-STYLE_OPTIONS = {
-    "Poolside Pastel Sundown v1": """Light: golden-hour soft key on faces; cyan pool bounce as fill; subtle sun rim on hair/shoulders; add gentle front fill so sunset does not over-model noses.
+# Light, grade and atmosphere shared verbatim by the golden-hour poolside scenes.
+_POOLSIDE_GOLDEN_PREAMBLE = """Light: golden-hour soft key on faces; cyan pool bounce as fill; subtle sun rim on hair/shoulders; add gentle front fill so sunset does not over-model noses.
 Grade: warm skin vs cool aqua; restrained pastel saturation; medium contrast; clean blacks; gentle halation on water speculars; no vignette.
 Atmosphere: mild breeze; soft water sparkle; background markings unreadable.
-Wardrobe & props: WOMAN wears a 1950s pastel playsuit/swimsuit with a light chiffon cover-up and a headscarf; she holds HER cat-eye sunglasses in hand (not worn). MAN wears a terry-cloth polo, high-waisted shorts, and a slim watch. Props ownership: striped towel belongs to MAN and is used by MAN to drape across WOMAN’s shoulders.
+"""
+
+STYLE_OPTIONS = {
+    "Poolside Pastel Sundown v1": _POOLSIDE_GOLDEN_PREAMBLE + """Wardrobe & props: WOMAN wears a 1950s pastel playsuit/swimsuit with a light chiffon cover-up and a headscarf; she holds HER cat-eye sunglasses in hand (not worn). MAN wears a terry-cloth polo, high-waisted shorts, and a slim watch. Props ownership: striped towel belongs to MAN and is used by MAN to drape across WOMAN’s shoulders.
 Finish: micro-cleanup only; retain fine skin texture; no skin smoothing or face slimming; both faces remain tack-sharp; props edges remain crisp where visible.""",
 
-  "Poolside Pastel Milkshakes v1": """Light: golden-hour soft key on faces; cyan pool bounce as fill; subtle sun rim on hair/shoulders; add gentle front fill so sunset does not over-model noses.
-Grade: warm skin vs cool aqua; restrained pastel saturation; medium contrast; clean blacks; gentle halation on water speculars; no vignette.
-Atmosphere: mild breeze; soft water sparkle; background markings unreadable.
-Wardrobe: WOMAN—retro summer dress, light robe draped over forearms, wedge sandals, cat-eye sunglasses (worn). MAN—short-sleeve shirt, tailored shorts, belt, loafers, light-tinted round sunglasses (worn). Each item belongs to the wearer. Footwear: if worn, left and right shoes for each person must match (identical pair); no mismatched shoes.
+  "Poolside Pastel Milkshakes v1": _POOLSIDE_GOLDEN_PREAMBLE + """Wardrobe: WOMAN—retro summer dress, light robe draped over forearms, wedge sandals, cat-eye sunglasses (worn). MAN—short-sleeve shirt, tailored shorts, belt, loafers, light-tinted round sunglasses (worn). Each item belongs to the wearer. Footwear: if worn, left and right shoes for each person must match (identical pair); no mismatched shoes.
 Props: two clear glasses with pastel milkshakes; each belongs to and is held by its owner; no additional props visible.
 Finish: micro-cleanup only; retain fine skin texture; no face slimming; control reflections in sunglasses; maintain sharp eyes and clean catchlights.""",
 
-  "Poolside Pastel Sunglasses Handoff": """Light: golden-hour soft key on faces; cyan pool bounce as fill; subtle sun rim on hair/shoulders; add gentle front fill so sunset does not over-model noses.
-Grade: warm skin vs cool aqua; restrained pastel saturation; medium contrast; clean blacks; gentle halation on water speculars; no vignette.
-Atmosphere: mild breeze; soft water sparkle; background markings unreadable.
-Wardrobe: WOMAN—retro swimsuit, lightweight robe draped open, fabric headband; she is NOT wearing the sunglasses (holds them). MAN—retro short-sleeve shirt, light trousers, low-profile sneakers. Each item belongs to the wearer. Footwear: if worn, left and right shoes for each person must match (identical pair); no mismatched shoes.
+  "Poolside Pastel Sunglasses Handoff": _POOLSIDE_GOLDEN_PREAMBLE + """Wardrobe: WOMAN—retro swimsuit, lightweight robe draped open, fabric headband; she is NOT wearing the sunglasses (holds them). MAN—retro short-sleeve shirt, light trousers, low-profile sneakers. Each item belongs to the wearer. Footwear: if worn, left and right shoes for each person must match (identical pair); no mismatched shoes.
 Props: a single pair of WOMAN’s sunglasses; MAN touches only the frame temple; no other props present.
 Finish: micro-cleanup only; natural skin texture; no face slimming; control eyewear reflections; maintain sharp eyes and clean catchlights.""",
 
-    "Poolside Pastel Sundown v2": """Light: golden-hour soft key on faces; cyan pool bounce as fill; subtle sun rim on hair/shoulders; add gentle front fill so sunset does not over-model noses.
-Grade: warm skin vs cool aqua; restrained pastel saturation; medium contrast; clean blacks; gentle halation on water speculars; no vignette.
-Atmosphere: mild breeze; soft water sparkle; background markings unreadable.
-Wardrobe & props: WOMAN wears a 1950s pastel playsuit/swimsuit with a light chiffon cover-up, a headscarf, and a neck scarf worn at collarbone level; her cat-eye sunglasses are worn on top of HER head (not in hand). MAN wears a bowling shirt, high-waisted shorts, and a slim watch; MAN is not wearing sunglasses. Ownership: the neck scarf belongs to WOMAN and is adjusted by MAN; no towel or bottle visible in this variant.
+    "Poolside Pastel Sundown v2": _POOLSIDE_GOLDEN_PREAMBLE + """Wardrobe & props: WOMAN wears a 1950s pastel playsuit/swimsuit with a light chiffon cover-up, a headscarf, and a neck scarf worn at collarbone level; her cat-eye sunglasses are worn on top of HER head (not in hand). MAN wears a bowling shirt, high-waisted shorts, and a slim watch; MAN is not wearing sunglasses. Ownership: the neck scarf belongs to WOMAN and is adjusted by MAN; no towel or bottle visible in this variant.
 Finish: micro-cleanup only; retain fine skin texture; no skin smoothing or face slimming; both faces remain tack-sharp; ensure scarf texture remains detailed where adjusted.""",
 
-  "Poolside Pastel Towel Adjust": """Light: golden-hour soft key on faces; cyan pool bounce as fill; subtle sun rim on hair/shoulders; add gentle front fill so sunset does not over-model noses.
-Grade: warm skin vs cool aqua; restrained pastel saturation; medium contrast; clean blacks; gentle halation on water speculars; no vignette.
-Atmosphere: mild breeze; soft water sparkle; background markings unreadable.
-Wardrobe: WOMAN—retro one-piece or romper, headscarf, small earrings. MAN—short-sleeve knit or polo, tailored shorts, belt, wristwatch. Each item belongs to the wearer.
+  "Poolside Pastel Towel Adjust": _POOLSIDE_GOLDEN_PREAMBLE + """Wardrobe: WOMAN—retro one-piece or romper, headscarf, small earrings. MAN—short-sleeve knit or polo, tailored shorts, belt, wristwatch. Each item belongs to the wearer.
 Props: MAN’s striped pastel towel across WOMAN’s shoulders; WOMAN’s glass cola bottle; no additional props.
 Finish: micro-cleanup only; retain natural skin texture; no face slimming; maintain crisp edges on towel and bottle.""",
 
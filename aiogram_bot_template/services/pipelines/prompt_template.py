@@ -0,0 +1,19 @@
+# aiogram_bot_template/services/pipelines/prompt_template.py
+import re
+from typing import Mapping
+
+_PLACEHOLDER_RE = re.compile(r"\{\{(\w+)\}\}")
+
+
+def fill_placeholders(template: str, values: Mapping[str, str]) -> str:
+    """
+    Substitutes every `{{KEY}}` placeholder of a prompt template in a single pass.
+
+    Args:
+        template: The prompt template.
+        values: Replacement text for each placeholder name.
+
+    Returns:
+        The filled prompt. Placeholders without a value are left untouched.
+    """
+    return _PLACEHOLDER_RE.sub(lambda m: values.get(m.group(1), m.group(0)), template)
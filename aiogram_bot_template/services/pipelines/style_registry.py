@@ -0,0 +1,54 @@
+# aiogram_bot_template/services/pipelines/style_registry.py
+import importlib
+import pkgutil
+from types import ModuleType
+from typing import Dict, Any, Iterable
+
+
+def _check_scene_keys(module: ModuleType) -> None:
+    """
+    Raises:
+        ValueError: If FRAMING_OPTIONS and STYLE_OPTIONS do not define the same scenes.
+    """
+    mismatched = set(module.FRAMING_OPTIONS).symmetric_difference(module.STYLE_OPTIONS)
+    if mismatched:
+        raise ValueError(
+            f"Style module '{module.__name__}' has scenes without a matching "
+            f"framing/style block: {sorted(mismatched)}"
+        )
+
+
+def discover_styles(package_path: Iterable[str], package_name: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Imports every module of a styles package and registers those defining STYLE_NAME.
+    Scene tables are validated here, so a broken style module fails at startup and
+    callers can index FRAMING_OPTIONS and STYLE_OPTIONS by any scene name directly.
+
+    Args:
+        package_path: The `__path__` of the styles package.
+        package_name: The `__name__` of the styles package.
+
+    Returns:
+        A dict mapping style IDs to their registry entries.
+    """
+    styles: Dict[str, Dict[str, Any]] = {}
+
+    for _, module_name, _ in pkgutil.iter_modules(package_path):
+        # Dynamically import the module
+        module = importlib.import_module(f".{module_name}", package_name)
+
+        # Check for required attributes in the module
+        style_id = getattr(module, "STYLE_NAME", "").upper().replace(" ", "_")
+        style_name_display = getattr(module, "STYLE_NAME", None)
+        preview_image_filename = f"{module_name}.png"
+
+        if style_id and style_name_display:
+            _check_scene_keys(module)
+            styles[style_id] = {
+                "id": style_id,
+                "name": style_name_display,
+                "module": module,
+                "preview_image": preview_image_filename
+            }
+
+    return styles
@@ -1,5 +1,6 @@
 # aiogram_bot_template/services/similarity_scorer.py
 import asyncio
+import base64
 import io
 import math
 import hashlib
@@ -65,6 +66,23 @@ def _sha1_bytes(b: bytes) -> str:
     h.update(b)
     return h.hexdigest()
 
+def centroid_cache_key(file_unique_ids: List[str]) -> str:
+    """Redis key for the identity centroid of a set of photos, independent of their order."""
+    digest = hashlib.blake2b("|".join(sorted(file_unique_ids)).encode("utf-8"), digest_size=16).hexdigest()
+    return f"centroid_{digest}"
+
+def encode_centroid(centroid: Optional[np.ndarray]) -> Optional[str]:
+    """Serializes a centroid to a base64 string of float32 values, for FSM storage."""
+    if centroid is None:
+        return None
+    return base64.b64encode(np.asarray(centroid, dtype=np.float32).tobytes()).decode("ascii")
+
+def decode_centroid(encoded: Optional[str]) -> Optional[np.ndarray]:
+    """Inverse of `encode_centroid`."""
+    if not encoded:
+        return None
+    return np.frombuffer(base64.b64decode(encoded), dtype=np.float32)
+
 # --- Processing constants ---
 STANDARD_TILE_WIDTH = 576
 STANDARD_TILE_HEIGHT = 512
@@ -358,18 +376,32 @@ def _extract_face_features_sync(img_bytes: bytes) -> Optional[dict]:
     """
     key = _sha1_bytes(img_bytes)
     if (cached := _EMB_CACHE.get(key)) is not None: return cached
-    app = _get_face_analysis_app()
     img = load_image_bgr_from_bytes(img_bytes)
     if img is None: return None
+    result = _extract_face_features_from_bgr(img, key)
+    if result is not None: _EMB_CACHE.put(key, result)
+    return result
+
+def _extract_face_features_from_bgr(img: np.ndarray, key: str) -> Optional[dict]:
+    """Runs face analysis on an already decoded BGR image and returns its largest face."""
+    app = _get_face_analysis_app()
     with _FACE_APP_LOCK: faces = app.get(img)
     if not faces: return None
     best_face = max(faces, key=lambda f: (f.bbox[2]-f.bbox[0])*(f.bbox[3]-f.bbox[1]))
     if best_face.normed_embedding is None: return None
-    result = {"embedding": best_face.normed_embedding.astype(np.float32), "bbox": tuple(map(float, best_face.bbox)),
-              "kps": best_face.kps.astype(np.float32) if best_face.kps is not None else None,
-              "det_score": float(best_face.det_score), "image_sha1": key}
-    _EMB_CACHE.put(key, result)
-    return result
+    return {"embedding": best_face.normed_embedding.astype(np.float32), "bbox": tuple(map(float, best_face.bbox)),
+            "kps": best_face.kps.astype(np.float32) if best_face.kps is not None else None,
+            "det_score": float(best_face.det_score), "image_sha1": key}
+
+def extract_front_view_features_sync(composite_bytes: bytes) -> Optional[dict]:
+    """
+    Extracts face features from the left (front) half of a front/side composite.
+    The half is analyzed as a view of the decoded image; it is never re-encoded.
+    """
+    img = load_image_bgr_from_bytes(composite_bytes)
+    if img is None: return None
+    front_view = np.ascontiguousarray(img[:, : img.shape[1] // 2])
+    return _extract_face_features_from_bgr(front_view, _sha1_bytes(composite_bytes))
 
 def _cosine_sim_matrix(embs: np.ndarray) -> np.ndarray: return embs @ embs.T
 
@@ -3,13 +3,45 @@ from aiohttp import web
 import base64
 
 from typing import TYPE_CHECKING
-import json
+import orjson
+
+from aiogram_bot_template.services import image_cache
 
 if TYPE_CHECKING:
     from redis.asyncio import Redis
 
 logger = logging.getLogger(__name__)
 
+# Composite layouts the proxy can render on the fly.
+_COMPOSITE_LAYOUTS = {"vert"}
+
+
+def _decode_id(encoded_id: str | None) -> str:
+    """Decodes a url-safe base64 cache ID taken from the request path."""
+    if not encoded_id:
+        raise web.HTTPBadRequest(reason="ID is missing")
+
+    try:
+        return base64.urlsafe_b64decode(encoded_id.encode("ascii")).decode("ascii")
+    except (ValueError, TypeError):
+        logger.warning("Failed to decode base64 ID: %s", encoded_id)
+        raise web.HTTPBadRequest(reason="Invalid ID format") from None
+
+
+def _decode_payload(file_unique_id: str, cached_json: bytes) -> tuple[bytes, str]:
+    """Decodes a cached JSON payload into file bytes and content type."""
+    try:
+        payload_dict = orjson.loads(cached_json)
+        content_type = payload_dict["content_type"]
+        file_bytes = base64.b64decode(payload_dict["data"])
+    except (orjson.JSONDecodeError, KeyError, TypeError) as e:
+        logger.exception(
+            "Could not decode JSON payload from Redis for key %s",
+            file_unique_id,
+        )
+        raise web.HTTPInternalServerError(reason="Cache data corrupted") from e
+    return file_bytes, content_type
+
 
 async def serve_cached_file(req: web.Request) -> web.Response:
     """
@@ -26,17 +58,7 @@ async def serve_cached_file(req: web.Request) -> web.Response:
         web.HTTPNotFound: If the file is not found in the cache.
         web.HTTPInternalServerError: If the cached data is corrupted.
     """
-    encoded_id = req.match_info.get("encoded_id")
-    if not encoded_id:
-        raise web.HTTPBadRequest(reason="ID is missing")
-
-    try:
-        file_unique_id = base64.urlsafe_b64decode(encoded_id.encode("ascii")).decode(
-            "ascii",
-        )
-    except (ValueError, TypeError):
-        logger.warning("Failed to decode base64 ID: %s", encoded_id)
-        raise web.HTTPBadRequest(reason="Invalid ID format") from None
+    file_unique_id = _decode_id(req.match_info.get("encoded_id"))
 
     # Get dp, and from it, the cache_pool.
     redis_cache: Redis = req.app["dp"]["cache_pool"]
@@ -46,16 +68,7 @@ async def serve_cached_file(req: web.Request) -> web.Response:
         logger.warning("Requested file not in Redis cache: %s", file_unique_id)
         raise web.HTTPNotFound(reason="File not found in cache")
 
-    try:
-        payload_dict = json.loads(cached_json)
-        content_type = payload_dict["content_type"]
-        file_bytes = base64.b64decode(payload_dict["data"])
-    except (json.JSONDecodeError, KeyError, TypeError) as e:
-        logger.exception(
-            "Could not decode JSON payload from Redis for key %s",
-            file_unique_id,
-        )
-        raise web.HTTPInternalServerError(reason="Cache data corrupted") from e
+    file_bytes, content_type = _decode_payload(file_unique_id, cached_json)
 
     return web.Response(
         body=file_bytes,
@@ -63,6 +76,46 @@ async def serve_cached_file(req: web.Request) -> web.Response:
     )
 
 
+async def serve_composite(req: web.Request) -> web.Response:
+    """
+    Serve a composite of two cached images, rendering and caching it on first request.
+
+    Args:
+        req: The incoming web request.
+
+    Returns:
+        The response object containing the composite JPEG.
+
+    Raises:
+        web.HTTPBadRequest: If an ID or the layout is missing or invalid.
+        web.HTTPNotFound: If either source image is not found in the cache.
+        web.HTTPInternalServerError: If cached data is corrupted or rendering fails.
+    """
+    layout = req.match_info.get("layout")
+    if layout not in _COMPOSITE_LAYOUTS:
+        raise web.HTTPBadRequest(reason="Unsupported composite layout")
+
+    top_uid = _decode_id(req.match_info.get("encoded_top"))
+    bottom_uid = _decode_id(req.match_info.get("encoded_bottom"))
+    composite_uid = image_cache.composite_uid(top_uid, bottom_uid, layout)
+
+    redis_cache: Redis = req.app["dp"]["cache_pool"]
+    photo_manager = req.app["dp"]["photo_manager"]
+    # Concurrent requests for the same composite (e.g. all frames of one generation)
+    # share a single render.
+    composite_bytes = await photo_manager.get_or_render_vertical_composite(top_uid, bottom_uid, redis_cache)
+    if not composite_bytes:
+        if not all(await image_cache.exists_bulk([top_uid, bottom_uid], redis_cache)):
+            logger.warning("Composite sources not in Redis cache: %s, %s", top_uid, bottom_uid)
+            raise web.HTTPNotFound(reason="File not found in cache")
+        logger.error("Failed to render composite for %s", composite_uid)
+        raise web.HTTPInternalServerError(reason="Composite rendering failed")
+
+    return web.Response(body=composite_bytes, content_type="image/jpeg")
+
+
 routes = [
     web.get("/file_cache/{encoded_id}", serve_cached_file),
+    # Kept under /file_cache/: the nginx site config only proxies that prefix.
+    web.get("/file_cache/composite/{layout}/{encoded_top}/{encoded_bottom}", serve_composite),
 ]